@@ -0,0 +1,324 @@
+"""Local stand-ins for the parts of the Notion and Discord REST APIs the bot uses.
+
+Both servers answer from memory after a fixed ``latency``, can enforce rate limits the
+way the real APIs report them, and count every request they see by route and status.
+"""
+import asyncio
+import json
+import random
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+TASK_STATUSES = ("Complete", "In progress", "Blocked", "Not started")
+
+# Property schemas ``databases.retrieve`` reports for the generated pages
+MEETING_SCHEMA = {"Name": {"type": "title"}, "Event time": {"type": "date"},
+                  "Type": {"type": "select"}, "External link": {"type": "url"}}
+TASK_SCHEMA = {"Name": {"type": "title"}, "Status": {"type": "select"}, "Assigned To": {"type": "people"}}
+
+
+def _iso(moment: datetime) -> str:
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _parse(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def make_meetings(count: int, seed: int = 0, edited: Optional[datetime] = None) -> List[Dict]:
+    """Notion calendar pages for ``count`` upcoming external meetings."""
+    rng = random.Random(seed)
+    edited = edited or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    start = edited.replace(hour=0, minute=0) + timedelta(days=1)
+    pages = []
+    for i in range(count):
+        begins = start + timedelta(hours=rng.randrange(0, 24 * 60), minutes=rng.choice((0, 15, 30, 45)))
+        pages.append({
+            "object": "page",
+            "id": f"00000000-0000-4000-8000-{i:012d}",
+            "last_edited_time": _iso(edited),
+            "properties": {
+                "Name": {"title": [{"text": {"content": f"Meeting {i}"}}]},
+                "Event time": {"date": {"start": begins.isoformat(),
+                                        "end": (begins + timedelta(minutes=rng.choice((30, 60, 90)))).isoformat()}},
+                "Type": {"select": {"name": "External"}},
+                "External link": {"url": f"https://example.com/meet/{i}"},
+            },
+        })
+    return pages
+
+
+def make_tasks(count: int, seed: int = 0, edited: Optional[datetime] = None) -> List[Dict]:
+    """Notion sprint pages for ``count`` tasks spread over the usual statuses.
+
+    Edit times are spread over the two weeks up to ``edited``, whole minutes like Notion
+    reports them, so an incremental query only sees the newest few.
+    """
+    rng = random.Random(seed)
+    edited = edited or datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    people = [f"Person {i}" for i in range(12)]
+    return [{
+        "object": "page",
+        "id": f"10000000-0000-4000-8000-{i:012d}",
+        "last_edited_time": _iso(edited - timedelta(minutes=rng.randrange(0, 14 * 24 * 60))),
+        "properties": {
+            "Name": {"title": [{"text": {"content": f"Task {i} " + "x" * rng.randrange(0, 60)}}]},
+            "Status": {"select": {"name": rng.choice(TASK_STATUSES)}},
+            "Assigned To": {"people": [{"name": name} for name in rng.sample(people, rng.randrange(0, 3))]},
+        },
+    } for i in range(count)]
+
+
+class FakeServer(ABC):
+    """Shared lifecycle and bookkeeping for the stand-in servers."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.url = ""
+        self._runner: Optional[web.AppRunner] = None
+
+    @abstractmethod
+    def routes(self, app: web.Application):
+        """Add the server's routes to ``app``."""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application()
+        self.routes(app)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def count(self, route: str, status: int):
+        self.requests[f"{route} {status}"] += 1
+
+    async def delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeNotion(FakeServer):
+    """``databases.retrieve``, ``pages.retrieve`` and paginated ``databases.query`` over in-memory pages.
+
+    ``rate`` caps requests per second across the integration (0 for no limit); excess
+    requests get Notion's 429 ``rate_limited`` error with a Retry-After header.
+    """
+
+    def __init__(self, databases: Dict[str, List[Dict]], titles: Optional[Dict[str, str]] = None,
+                 schemas: Optional[Dict[str, Dict]] = None, latency: float = 0.0, rate: float = 0.0):
+        super().__init__(latency)
+        self.databases = databases
+        self.titles = titles or {}
+        self.schemas = schemas or {}
+        self.rate = rate
+        self._tokens = rate
+        self._refilled = time.monotonic()
+
+    def routes(self, app: web.Application):
+        app.router.add_get("/v1/databases/{database_id}", self.retrieve)
+        app.router.add_post("/v1/databases/{database_id}/query", self.query)
+        app.router.add_get("/v1/pages/{page_id}", self.retrieve_page)
+
+    def _limited(self) -> Optional[web.Response]:
+        if not self.rate:
+            return None
+        now = time.monotonic()
+        self._tokens = min(self.rate, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return web.json_response({"object": "error", "status": 429, "code": "rate_limited",
+                                  "message": "You have been rate limited."},
+                                 status=429, headers={"Retry-After": str(max(1, round(1 / self.rate)))})
+
+    async def retrieve(self, request: web.Request) -> web.Response:
+        await self.delay()
+        limited = self._limited()
+        if limited is not None:
+            self.count("GET databases/{id}", 429)
+            return limited
+        database_id = request.match_info["database_id"]
+        if database_id not in self.databases:
+            self.count("GET databases/{id}", 404)
+            return web.json_response({"object": "error", "status": 404, "code": "object_not_found",
+                                      "message": "Database not found"}, status=404)
+        self.count("GET databases/{id}", 200)
+        title = self.titles.get(database_id, "Sprint")
+        properties = {name: dict(prop, id=name, name=name, **{prop["type"]: {}})
+                      for name, prop in self.schemas.get(database_id, {}).items()}
+        return web.json_response({"object": "database", "id": database_id,
+                                  "title": [{"type": "text", "text": {"content": title}, "plain_text": title}],
+                                  "properties": properties})
+
+    async def retrieve_page(self, request: web.Request) -> web.Response:
+        await self.delay()
+        limited = self._limited()
+        if limited is not None:
+            self.count("GET pages/{id}", 429)
+            return limited
+        page_id = request.match_info["page_id"]
+        for database_id, pages in self.databases.items():
+            for page in pages:
+                if page["id"] == page_id:
+                    self.count("GET pages/{id}", 200)
+                    return web.json_response(dict(page, parent={"type": "database_id", "database_id": database_id}))
+        self.count("GET pages/{id}", 404)
+        return web.json_response({"object": "error", "status": 404, "code": "object_not_found",
+                                  "message": "Page not found"}, status=404)
+
+    def touch(self, database_id: str, count: int, seed: int = 0):
+        """Edit ``count`` pages of a database a minute after its newest edit, cycling their status."""
+        pages = self.databases[database_id]
+        edited = _iso(max(_parse(page["last_edited_time"]) for page in pages) + timedelta(minutes=1))
+        for page in random.Random(seed).sample(pages, min(count, len(pages))):
+            page["last_edited_time"] = edited
+            status = page["properties"].get("Status", {}).get("select")
+            if status:
+                status["name"] = TASK_STATUSES[(TASK_STATUSES.index(status["name"]) + 1) % len(TASK_STATUSES)]
+
+    @staticmethod
+    def _matches(page: Dict, page_filter: Optional[Dict]) -> bool:
+        if not page_filter or page_filter.get("timestamp") != "last_edited_time":
+            return True
+        edited = _parse(page["last_edited_time"])
+        condition = page_filter["last_edited_time"]
+        if "after" in condition and not edited > _parse(condition["after"]):
+            return False
+        if "on_or_after" in condition and not edited >= _parse(condition["on_or_after"]):
+            return False
+        return True
+
+    async def query(self, request: web.Request) -> web.Response:
+        await self.delay()
+        limited = self._limited()
+        if limited is not None:
+            self.count("POST databases/{id}/query", 429)
+            return limited
+        body = await request.json() if request.can_read_body else {}
+        pages = [page for page in self.databases.get(request.match_info["database_id"], [])
+                 if self._matches(page, body.get("filter"))]
+        start = int(body.get("start_cursor") or 0)
+        end = start + min(int(body.get("page_size") or 100), 100)
+        self.count("POST databases/{id}/query", 200)
+        return web.json_response({"object": "list", "results": pages[start:end],
+                                  "next_cursor": str(end) if end < len(pages) else None,
+                                  "has_more": end < len(pages)})
+
+
+class FakeDiscord(FakeServer):
+    """Guild scheduled-event routes, with per-route rate-limit buckets reported in headers.
+
+    Each route gets ``limit`` requests per ``window`` seconds (0 for no limit), and
+    answers beyond that with a 429 and ``retry_after`` the way Discord does.
+    ``limit_globally`` makes the next requests hit the global limit instead, whose 429s
+    carry ``Retry-After`` but no bucket headers.
+    """
+
+    def __init__(self, latency: float = 0.0, limit: int = 0, window: float = 1.0):
+        super().__init__(latency)
+        self.limit = limit
+        self.window = window
+        self.events: Dict[str, Dict] = {}
+        self._next_id = 1
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._global_429s = 0
+        self._global_retry_after = 0.0
+
+    def routes(self, app: web.Application):
+        base = "/api/v10/guilds/{guild_id}/scheduled-events"
+        app.router.add_get(base, self.list_events)
+        app.router.add_post(base, self.create_event)
+        app.router.add_get(base + "/{event_id}", self.get_event)
+        app.router.add_patch(base + "/{event_id}", self.modify_event)
+
+    def reset(self):
+        self.events.clear()
+
+    def limit_globally(self, count: int, retry_after: float):
+        self._global_429s = count
+        self._global_retry_after = retry_after
+
+    def _bucket(self, route: str) -> Dict[str, str]:
+        """Take a slot in the route's window, returning rate-limit headers or raising a 429."""
+        if not self.limit:
+            return {}
+        now = time.monotonic()
+        started, used = self._windows.get(route, (now, 0))
+        if now - started >= self.window:
+            started, used = now, 0
+        reset_after = self.window - (now - started)
+        headers = {"X-RateLimit-Limit": str(self.limit), "X-RateLimit-Bucket": f"bucket-{zlib.crc32(route.encode()):08x}",
+                   "X-RateLimit-Reset-After": f"{reset_after:.3f}"}
+        if used >= self.limit:
+            headers["X-RateLimit-Remaining"] = "0"
+            headers["Retry-After"] = f"{reset_after:.3f}"
+            raise web.HTTPTooManyRequests(
+                text=json.dumps({"message": "You are being rate limited.", "retry_after": reset_after,
+                                 "global": False}),
+                content_type="application/json", headers=headers)
+        self._windows[route] = (started, used + 1)
+        headers["X-RateLimit-Remaining"] = str(self.limit - used - 1)
+        return headers
+
+    async def _handle(self, route: str, handler) -> web.Response:
+        await self.delay()
+        if self._global_429s:
+            self._global_429s -= 1
+            self.count(route, 429)
+            return web.json_response({"message": "You are being rate limited.",
+                                      "retry_after": self._global_retry_after, "global": True},
+                                     status=429, headers={"Retry-After": str(self._global_retry_after),
+                                                          "X-RateLimit-Global": "true"})
+        try:
+            headers = self._bucket(route)
+        except web.HTTPTooManyRequests as e:
+            self.count(route, 429)
+            return e
+        status, body = handler()
+        self.count(route, status)
+        return web.json_response(body, status=status, headers=headers)
+
+    async def list_events(self, request: web.Request) -> web.Response:
+        return await self._handle("GET scheduled-events", lambda: (200, list(self.events.values())))
+
+    async def get_event(self, request: web.Request) -> web.Response:
+        event = self.events.get(request.match_info["event_id"])
+        return await self._handle("GET scheduled-events/{id}",
+                                  lambda: (200, event) if event else (404, {"message": "Unknown Guild Scheduled Event"}))
+
+    async def create_event(self, request: web.Request) -> web.Response:
+        data = await request.json()
+
+        def create():
+            event_id = str(10 ** 17 + self._next_id)
+            self._next_id += 1
+            self.events[event_id] = dict(data, id=event_id, guild_id=request.match_info["guild_id"])
+            return 200, self.events[event_id]
+        return await self._handle("POST scheduled-events", create)
+
+    async def modify_event(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        event_id = request.match_info["event_id"]
+
+        def modify():
+            if event_id not in self.events:
+                return 404, {"message": "Unknown Guild Scheduled Event"}
+            self.events[event_id].update(data)
+            return 200, self.events[event_id]
+        return await self._handle("PATCH scheduled-events/{id}", modify)
@@ -0,0 +1,232 @@
+"""Offline benchmarks for the meeting sync and sprint dashboard paths.
+
+Runs ``LocalBot`` against the local Notion and Discord stand-ins in ``bench.fake_servers``
+with synthetic data, so nothing leaves the machine and no tokens are needed::
+
+    python -m bench.run --sizes 10,100,1000,10000 --repeat 5 --json before.json
+    python -m bench.run --sizes 10,100,1000,10000 --repeat 5 --compare before.json
+
+Each scenario is warmed up, then timed ``--repeat`` times with the bot's own output
+silenced. Latency and rate limits are fixed and the data is seeded, so the medians
+are comparable between commits run on the same machine.
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from bench.fake_servers import MEETING_SCHEMA, TASK_SCHEMA, FakeDiscord, FakeNotion, make_meetings, make_tasks
+
+CALENDAR_ID = "calendar"
+SPRINT_ID = "sprint"
+GUILD_ID = "100000000000000000"
+
+
+class FakeMessage:
+    def __init__(self, message_id: int):
+        self.id = message_id
+
+
+class FakeGuild:
+    def __init__(self, guild_id: str):
+        self.id = int(guild_id)
+
+
+class FakeContext:
+    """Just enough of a command context for the dashboard command to send into."""
+
+    def __init__(self):
+        self.sent = 0
+        self.guild = FakeGuild(GUILD_ID)
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+        return FakeMessage(self.sent)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))]
+
+
+class Bench:
+    def __init__(self, args: argparse.Namespace, size: int):
+        self.args = args
+        self.size = size
+        self.notion = FakeNotion({CALENDAR_ID: make_meetings(size, args.seed), SPRINT_ID: make_tasks(size, args.seed)},
+                                 titles={SPRINT_ID: "Benchmark Sprint"},
+                                 schemas={CALENDAR_ID: MEETING_SCHEMA, SPRINT_ID: TASK_SCHEMA},
+                                 latency=args.notion_latency, rate=args.notion_rate)
+        self.discord = FakeDiscord(latency=args.discord_latency, limit=args.discord_limit, window=args.discord_window)
+        self.ctx = FakeContext()
+        self.bot = None
+
+    async def __aenter__(self):
+        notion_url = await self.notion.start()
+        discord_url = await self.discord.start()
+        self.config_dir = tempfile.TemporaryDirectory()
+        os.environ.update({
+            "NOTION_BASE_URL": notion_url,
+            "DISCORD_API_BASE": f"{discord_url}/api/v10",
+            "CALENDAR_ID": CALENDAR_ID,
+            "GUILD_ID": GUILD_ID,
+            "DISCORD_BOT_TOKEN": "bench",
+            "NOTION_API_KEY": "bench",
+            "CONFIG_FILE": os.path.join(self.config_dir.name, "config.json"),
+        })
+        from local_bot import LocalBot
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            self.bot = LocalBot()
+        if not self.bot.valid:
+            raise RuntimeError("LocalBot failed to initialise against the stand-in servers")
+        self.guild = self.bot.guild_states[GUILD_ID]
+        self.guild.config["channel_dict"] = {"Update": "1"}
+        self.guild.config["current_sprint_id"] = SPRINT_ID
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.bot.store.aflush()
+        for notion in self.bot.notion_gateways.values():
+            await notion.aclose()
+        if self.bot._http_session is not None:
+            await self.bot._http_session.close()
+        await self.notion.stop()
+        await self.discord.stop()
+        self.config_dir.cleanup()
+
+    # Scenario setups put the bot back in the same state before every timed run
+
+    def fresh_meetings(self):
+        self.guild.meetings.clear()
+        self.guild.config["last_query_time"] = "2020-01-01T00:00:00.000Z"
+        self.discord.reset()
+
+    def globally_limited_meetings(self):
+        self.fresh_meetings()
+        self.discord.limit_globally(1, 0.05)
+
+    def resync_meetings(self):
+        self.guild.config["last_query_time"] = "2020-01-01T00:00:00.000Z"
+
+    def cold_dashboard(self):
+        self.guild.sprint_index = None
+        self.guild.meeting_extractor = None
+        self.bot.sprint_cache.clear()
+
+    def warm_dashboard(self):
+        self.bot.sprint_cache.clear()
+        # A handful of tasks edited since the last refresh, as between two real dashboard calls
+        self.notion.touch(SPRINT_ID, 5, self.args.seed)
+
+    def scenarios(self) -> Dict[str, tuple]:
+        """Name -> (setup, timed coroutine function)."""
+        return {
+            "meetings_create": (self.fresh_meetings, lambda: self.bot.process_meetings(self.guild)),
+            "meetings_global_limit": (self.globally_limited_meetings, self.meetings_global_limit),
+            "meetings_unchanged": (self.resync_meetings, lambda: self.bot.process_meetings(self.guild)),
+            "dashboard_cold": (self.cold_dashboard, lambda: self.bot.get_sprint_dashboard(self.ctx)),
+            "dashboard_incremental": (self.warm_dashboard, lambda: self.bot.get_sprint_dashboard(self.ctx)),
+            # The Friday rush: many members asking for the dashboard and a meeting sync at once
+            "concurrent_commands": (self.cold_dashboard, self.concurrent_commands),
+        }
+
+    async def meetings_global_limit(self):
+        # A 429 without bucket headers once left its bucket closed for good, so bound the run
+        try:
+            await asyncio.wait_for(self.bot.process_meetings(self.guild), 30)
+        except asyncio.TimeoutError:
+            raise RuntimeError("Meeting sync stalled after a global 429") from None
+
+    async def concurrent_commands(self):
+        await asyncio.gather(*(self.bot.get_sprint_dashboard(self.ctx) for _ in range(self.args.concurrency)),
+                             *(self.bot.process_meetings(self.guild) for _ in range(self.args.concurrency)))
+
+    async def measure(self, setup: Callable[[], None], run: Callable[[], Awaitable]) -> Dict:
+        durations = []
+        requests = {}
+        for attempt in range(self.args.warmup + self.args.repeat):
+            setup()
+            await self.bot.store.aflush()
+            gc.collect()
+            before_notion, before_discord = self.notion.requests.copy(), self.discord.requests.copy()
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                start = time.perf_counter()
+                await run()
+                elapsed = time.perf_counter() - start
+            if attempt >= self.args.warmup:
+                durations.append(elapsed)
+                requests = {**{f"notion {key}": count for key, count in (self.notion.requests - before_notion).items()},
+                            **{f"discord {key}": count for key, count in (self.discord.requests - before_discord).items()}}
+        median = statistics.median(durations)
+        return {"size": self.size, "runs": len(durations), "median_s": median,
+                "p50_s": percentile(durations, 0.5), "p99_s": percentile(durations, 0.99),
+                "throughput_per_s": self.size / median if median else float("inf"),
+                "requests": dict(sorted(requests.items()))}
+
+
+async def run_benchmarks(args: argparse.Namespace) -> Dict[str, Dict[str, Dict]]:
+    results: Dict[str, Dict[str, Dict]] = {}
+    for size in args.sizes:
+        async with Bench(args, size) as bench:
+            for name, (setup, run) in bench.scenarios().items():
+                if args.only and name not in args.only:
+                    continue
+                result = await bench.measure(setup, run)
+                results.setdefault(name, {})[str(size)] = result
+                print(f"{name:<24}{size:>7}  median {result['median_s'] * 1000:9.1f} ms  "
+                      f"p99 {result['p99_s'] * 1000:9.1f} ms  {result['throughput_per_s']:10.1f}/s  "
+                      f"requests {sum(result['requests'].values())}", flush=True)
+    return results
+
+
+def print_comparison(results: Dict, baseline: Dict):
+    print("\nMedian time against baseline (lower is better):")
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            before = baseline.get("results", {}).get(name, {}).get(size)
+            if before:
+                change = result["median_s"] / before["median_s"] - 1
+                print(f"{name:<24}{size:>7}  {before['median_s'] * 1000:9.1f} -> {result['median_s'] * 1000:9.1f} ms"
+                      f"  ({change:+.1%})")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=lambda value: [int(size) for size in value.split(",")],
+                        default=[10, 100, 1000, 10000], help="comma separated meeting/task counts")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per scenario and size")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before the timed ones")
+    parser.add_argument("--only", nargs="*", help="scenario names to run, all by default")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=10, help="simultaneous callers in concurrent_commands")
+    parser.add_argument("--notion-latency", type=float, default=0.005, help="seconds added to every Notion call")
+    parser.add_argument("--notion-rate", type=float, default=0, help="Notion requests per second, 0 for no limit")
+    parser.add_argument("--discord-latency", type=float, default=0.005, help="seconds added to every Discord call")
+    parser.add_argument("--discord-limit", type=int, default=0, help="Discord requests per route per window")
+    parser.add_argument("--discord-window", type=float, default=1.0, help="Discord rate-limit window in seconds")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str] = None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    results = asyncio.run(run_benchmarks(args))
+    if args.json:
+        settings = {key: value for key, value in vars(args).items() if key not in ("json", "compare")}
+        with open(args.json, "w") as file:
+            json.dump({"settings": settings, "results": results}, file, indent=4)
+    if args.compare:
+        with open(args.compare) as file:
+            print_comparison(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
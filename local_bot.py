@@ -1,28 +1,191 @@
-import json
-from typing import Union, Dict
+from typing import Union, Dict, Optional, Tuple, AsyncIterator, Iterable, List, Sequence, FrozenSet
 
+import aiohttp
 import discord
-import requests
 import os
 import asyncio
+import contextlib
+import functools
+import random
+import signal
+import time
 
-from discord.ext import commands, tasks
-from notion_client import Client as NotionClient
+from discord.ext import commands
 from dotenv import load_dotenv
-from util.util import get_env_var, get_notion_url, get_discord_event_url
+from util.cache import TTLCache
+from util.dashboards import DashboardSnapshots
+from util.guilds import DEFAULT_QUERY_TIME, GuildState, migrate_config
+from util.meeting_index import MeetingEntry, MeetingIndex, parse_event_time
+from util.metrics import COMMAND_ERRORS, COMMAND_LATENCY, MEETING_SYNC_DURATION, MetricsServer, \
+    monitor_loop_lag, observe_api_call, register_cache, register_dashboards
+from util.notion import NotionGateway, notion_errors
+from util.notion_schema import FieldSpec, PropertyExtractor
+from util.permissions import DEFAULT_ACL_KEY, PermissionMatrix, resolve_role_ids
+from util.rate_limit import DiscordRateLimiter
+from util.scheduler import Scheduler
+from util.scheduled_events import build_event_data, event_needs_update
+from util.startup import StartupTrace
+from util.singleflight import SingleFlight
+from util.sprint_index import DEFAULT_STATUS_BUCKETS, TASK_FIELDS, SprintSnapshot, SprintTaskIndex, StatusBucket, \
+    StatusBuckets, TaskRecord
+from util.store import ConfigStore, open_config_store
+from util.webhook import NotionWebhookReceiver
+from util.workers import WorkerPool
+from util.util import get_env_var, get_env_int, get_env_float, get_notion_url, get_discord_event_url, get_rss_bytes
 from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo
 
 EXCLUDED_COMMANDS = ["help", "about"]
+# Who may run the other commands, overridable with "command_roles" in the config. Keys are
+# command names or "*" for the rest, values are role IDs (names are resolved to IDs too).
+DEFAULT_COMMAND_ROLES = {DEFAULT_ACL_KEY: ["Dev Team"]}
+
+HTTP_POOL_SIZE = 20  # Max pooled connections shared by Discord REST and IP lookups
+HTTP_KEEPALIVE = 60  # Seconds an idle pooled connection is kept open
+HTTP_TIMEOUT = 15  # Total seconds allowed per outbound request
+
+SPRINT_REMINDER_CRON = "0 18 * * 5"  # Default weekly sprint post, Fridays at 6pm in SCHEDULER_TIMEZONE
+
+MEETING_SYNC_MIN_INTERVAL = 60  # Default fastest background meeting sync, in seconds
+MEETING_SYNC_MAX_INTERVAL = 1800  # Default slowest background meeting sync, in seconds
+MEETING_SYNC_JITTER = 0.1  # +/- fraction applied to every background sync interval
+
+TASKS_PER_PAGE = 10
+MAX_TASK_NAME_LENGTH = 60
+MAX_FIELD_LENGTH = 1000  # Embed fields cap at 1024 characters, leave some buffer
+
+# Meeting fields the sync reads, and the Notion calendar properties they come from
+MEETING_FIELDS = {
+    "title": FieldSpec("Name", "title", ""),
+    "event_time": FieldSpec("Event time", "date"),
+    "type": FieldSpec("Type", "select", "Unknown"),
+    "link": FieldSpec("External link", "url"),
+}
+
+
+def render_task_pages(tasks: Sequence[TaskRecord], title: str, emoji: str, color: discord.Color) -> Tuple[discord.Embed, ...]:
+    """Render every page of a task list up front, so paging only swaps in an already built embed."""
+    total_pages = max((len(tasks) - 1) // TASKS_PER_PAGE + 1, 1)
+    pages = []
+
+    for page in range(total_pages):
+        start_idx = page * TASKS_PER_PAGE
+        page_tasks = tasks[start_idx:start_idx + TASKS_PER_PAGE]
+
+        # Create the embed
+        embed = discord.Embed(
+            title=f"{emoji} {title}",
+            color=color
+        )
+
+        # Add pagination info if needed
+        if len(tasks) > TASKS_PER_PAGE:
+            embed.description = f"Page {page + 1} of {total_pages}"
+
+        # Add tasks to embed as clickable links
+        if page_tasks:
+            field_lines = []
+            field_length = 0
+
+            for i, task in enumerate(page_tasks, start=start_idx + 1):
+                # Truncate task name to prevent overly long lines
+                truncated_name = task.name[:MAX_TASK_NAME_LENGTH]
+                if len(task.name) > MAX_TASK_NAME_LENGTH:
+                    truncated_name += "..."
+
+                # Create clickable link format
+                task_line = f"**{i}.** [📄 {truncated_name}]({task.url})"
+
+                # Lines are joined by a blank line, start a new field before passing the limit
+                added_length = len(task_line) + (2 if field_lines else 0)
+                if field_lines and field_length + added_length > MAX_FIELD_LENGTH:
+                    embed.add_field(name="Tasks", value="\n\n".join(field_lines), inline=False)
+                    field_lines = []
+                    added_length = len(task_line)
+                    field_length = 0
+                field_lines.append(task_line)
+                field_length += added_length
+
+            # Add the final field
+            embed.add_field(name="Tasks", value="\n\n".join(field_lines), inline=False)
+        else:
+            embed.add_field(
+                name="Tasks",
+                value="No tasks found.",
+                inline=False
+            )
+
+        pages.append(embed)
+
+    return tuple(pages)
+
+
+# Dashboard buckets carry their colour by name, resolved here so the index stays free of discord
+def bucket_color(bucket: StatusBucket) -> discord.Color:
+    return getattr(discord.Color, bucket.color, discord.Color.blurple)()
+
+
+def get_status_buckets(interaction: discord.Interaction) -> StatusBuckets:
+    """Status buckets of the guild an interaction came from."""
+    guild = interaction.client.guild_states.get(str(interaction.guild_id))
+    return guild.status_buckets if guild else interaction.client.status_buckets
+
+
+def get_task_pages(dashboards: DashboardSnapshots, message_id: int, bucket: StatusBucket):
+    """Pre-rendered pages for one bucket of a stored dashboard, or None once it has been evicted."""
+    return dashboards.get_pages(message_id, bucket.key,
+                                lambda tasks: render_task_pages(tasks, f"{bucket.label} ({len(tasks)})",
+                                                                bucket.emoji, bucket_color(bucket)))
+
+
+class SprintCategoryButton(discord.ui.DynamicItem[discord.ui.Button],
+                           template=r"sprint_dashboard:(?P<category>\w+)"):
+    """Dashboard button for one status bucket, answered from the task snapshot stored for the clicked message.
+
+    Buckets come from the config, so the buttons are matched by custom_id pattern rather
+    than registered one by one, and dashboards posted before a bucket change keep working.
+    """
+
+    def __init__(self, bucket: StatusBucket):
+        super().__init__(discord.ui.Button(
+            label=bucket.label,
+            style=getattr(discord.ButtonStyle, bucket.style, discord.ButtonStyle.secondary),
+            emoji=bucket.emoji or None,
+            custom_id=f"sprint_dashboard:{bucket.key}"
+        ))
+        self.bucket = bucket
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(get_status_buckets(interaction).get(match["category"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        dashboards = interaction.client.dashboards
+        snapshot = dashboards.get(interaction.message.id)
+        if snapshot is None:
+            await interaction.response.send_message("This dashboard has expired, run `c!sprint` for a fresh one.",
+                                                    ephemeral=True)
+            return
+
+        if not snapshot.categories.get(self.bucket.key):
+            await interaction.response.send_message(self.bucket.empty, ephemeral=True)
+            return
+
+        pages = get_task_pages(dashboards, interaction.message.id, self.bucket)
+        view = TaskListView(interaction.message.id, self.bucket.key, pages)
+
+        # Send as ephemeral so only the user who clicked sees it
+        await interaction.response.send_message(embed=view.get_embed(), view=view, ephemeral=True)
 
 
 class SprintDashboardView(discord.ui.View):
-    def __init__(self, sprint_id: str, completed_tasks: list, in_progress_tasks: list, blocked_tasks: list):
-        super().__init__(timeout=300)
-        self.sprint_id = sprint_id
-        self.completed_tasks = completed_tasks
-        self.in_progress_tasks = in_progress_tasks
-        self.blocked_tasks = blocked_tasks
-        
+    """One button per status bucket, plus a link to the sprint in Notion."""
+
+    def __init__(self, buckets: StatusBuckets, sprint_id: str = ""):
+        super().__init__(timeout=None)
+        for bucket in buckets:
+            self.add_item(SprintCategoryButton(bucket))
+
         # Add the direct link button
         if sprint_id:
             base_url = f"https://www.notion.so/{sprint_id.replace('-', '')}"
@@ -32,59 +195,46 @@ class SprintDashboardView(discord.ui.View):
                 emoji="📝",
                 url=base_url
             ))
-    
-    @discord.ui.button(label="Completed Tasks", style=discord.ButtonStyle.success, emoji="✅")
-    async def completed_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not self.completed_tasks:
-            await interaction.response.send_message("No completed tasks in this sprint.", ephemeral=True)
-            return
-        
-        view = TaskListView(self.completed_tasks, f"Completed Tasks ({len(self.completed_tasks)})", "✅", dashboard_view=self)
-        
-        embed = view.get_embed()
-        embed.color = discord.Color.green()
-        
-        # Send as ephemeral so only the user who clicked sees it
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-    
-    @discord.ui.button(label="In Progress Tasks", style=discord.ButtonStyle.primary, emoji="🔄")
-    async def in_progress_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not self.in_progress_tasks:
-            await interaction.response.send_message("No tasks in progress in this sprint.", ephemeral=True)
-            return
-        
-        view = TaskListView(self.in_progress_tasks, f"In Progress Tasks ({len(self.in_progress_tasks)})", "🔄", dashboard_view=self)
-        
-        embed = view.get_embed()
-        embed.color = discord.Color.blue()
-        
-        # Send as ephemeral so only the user who clicked sees it
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-    
-    @discord.ui.button(label="Blocked Tasks", style=discord.ButtonStyle.danger, emoji="🚫")
-    async def blocked_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not self.blocked_tasks:
-            await interaction.response.send_message("No blocked tasks in this sprint.", ephemeral=True)
+
+
+class TaskPageButton(discord.ui.DynamicItem[discord.ui.Button],
+                     template=r"task_page:(?P<message_id>\d+):(?P<category>\w+):(?P<page>\d+)"):
+    """Previous/Next button whose custom_id carries the dashboard, category and target page,
+    so paging keeps working after a restart."""
+
+    def __init__(self, message_id: int, category: str, page: int, label: str):
+        super().__init__(discord.ui.Button(
+            label=label,
+            style=discord.ButtonStyle.secondary,
+            custom_id=f"task_page:{message_id}:{category}:{page}"
+        ))
+        self.message_id = message_id
+        self.category = category
+        self.page = page
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["message_id"]), match["category"], int(match["page"]), item.label)
+
+    async def callback(self, interaction: discord.Interaction):
+        pages = get_task_pages(interaction.client.dashboards, self.message_id,
+                               get_status_buckets(interaction).get(self.category))
+        if pages is None:
+            await interaction.response.send_message("This dashboard has expired, run `c!sprint` for a fresh one.",
+                                                    ephemeral=True)
             return
-        
-        view = TaskListView(self.blocked_tasks, f"Blocked Tasks ({len(self.blocked_tasks)})", "🚫", dashboard_view=self)
-        
-        embed = view.get_embed()
-        embed.color = discord.Color.red()
-        
-        # Send as ephemeral so only the user who clicked sees it
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        view = TaskListView(self.message_id, self.category, pages, min(self.page, len(pages) - 1))
+        await interaction.response.edit_message(embed=view.get_embed(), view=view)
 
 
 class TaskListView(discord.ui.View):
-    def __init__(self, tasks: list, title: str, emoji: str, page: int = 0, dashboard_view: SprintDashboardView = None):
-        super().__init__(timeout=300)
-        self.tasks = tasks
-        self.title = title
-        self.emoji = emoji
+    def __init__(self, message_id: int, category: str, pages: Tuple[discord.Embed, ...], page: int = 0):
+        super().__init__(timeout=None)
+        self.message_id = message_id
+        self.category = category
+        # Pre-rendered and shared with other viewers, so never mutate these embeds
+        self.pages = pages
         self.page = page
-        self.tasks_per_page = 10
-        self.dashboard_view = dashboard_view
         
         self.update_buttons()
     
@@ -92,27 +242,12 @@ class TaskListView(discord.ui.View):
         self.clear_items()
         
         # Add navigation buttons if needed
-        if len(self.tasks) > self.tasks_per_page:
+        if len(self.pages) > 1:
             if self.page > 0:
-                prev_button = discord.ui.Button(
-                    label="◀ Previous",
-                    style=discord.ButtonStyle.secondary,
-                    custom_id="prev"
-                )
-                prev_button.callback = self.previous_page
-                self.add_item(prev_button)
-            
-            start_idx = self.page * self.tasks_per_page
-            end_idx = min(start_idx + self.tasks_per_page, len(self.tasks))
+                self.add_item(TaskPageButton(self.message_id, self.category, self.page - 1, "◀ Previous"))
             
-            if end_idx < len(self.tasks):
-                next_button = discord.ui.Button(
-                    label="Next ▶",
-                    style=discord.ButtonStyle.secondary,
-                    custom_id="next"
-                )
-                next_button.callback = self.next_page
-                self.add_item(next_button)
+            if self.page < len(self.pages) - 1:
+                self.add_item(TaskPageButton(self.message_id, self.category, self.page + 1, "Next ▶"))
         
         # # Add back button (always present)
         # back_button = discord.ui.Button(
@@ -124,87 +259,7 @@ class TaskListView(discord.ui.View):
         # self.add_item(back_button)
     
     def get_embed(self):
-        start_idx = self.page * self.tasks_per_page
-        end_idx = min(start_idx + self.tasks_per_page, len(self.tasks))
-        page_tasks = self.tasks[start_idx:end_idx]
-        
-        # Create the embed
-        embed = discord.Embed(
-            title=f"{self.emoji} {self.title}",
-            color=discord.Color.blue()
-        )
-        
-        # Add pagination info if needed
-        if len(self.tasks) > self.tasks_per_page:
-            total_pages = (len(self.tasks) - 1) // self.tasks_per_page + 1
-            embed.description = f"Page {self.page + 1} of {total_pages}"
-        
-        # Add tasks to embed as clickable links
-        if page_tasks:
-            current_field_text = ""
-            field_count = 1
-            
-            for i, task in enumerate(page_tasks, start=start_idx + 1):
-                # Truncate task name to prevent overly long lines
-                max_task_name_length = 60
-                truncated_name = task['name'][:max_task_name_length]
-                if len(task['name']) > max_task_name_length:
-                    truncated_name += "..."
-                
-                # Create clickable link format
-                task_link = f"[📄 {truncated_name}]({task['url']})"
-                task_line = f"**{i}.** {task_link}"
-                
-                # Check if adding this task would exceed the 1024 character limit
-                test_text = current_field_text + ("\n\n" if current_field_text else "") + task_line
-                
-                if len(test_text) > 1000:  # Leave some buffer
-                    # Add current field and start a new one
-                    field_name = "Tasks"
-                    embed.add_field(
-                        name=field_name,
-                        value=current_field_text,
-                        inline=False
-                    )
-                    current_field_text = task_line
-                    field_count += 1
-                else:
-                    if current_field_text:
-                        current_field_text += "\n\n" + task_line
-                    else:
-                        current_field_text = task_line
-            
-            # Add the final field
-            if current_field_text:
-                field_name = "Tasks"
-                embed.add_field(
-                    name=field_name,
-                    value=current_field_text,
-                    inline=False
-                )
-        else:
-            embed.add_field(
-                name="Tasks",
-                value="No tasks found.",
-                inline=False
-            )
-        
-        return embed
-    
-    async def previous_page(self, interaction: discord.Interaction):
-        if self.page > 0:
-            self.page -= 1
-            self.update_buttons()
-            embed = self.get_embed()
-            await interaction.response.edit_message(embed=embed, view=self)
-    
-    async def next_page(self, interaction: discord.Interaction):
-        max_page = (len(self.tasks) - 1) // self.tasks_per_page
-        if self.page < max_page:
-            self.page += 1
-            self.update_buttons()
-            embed = self.get_embed()
-            await interaction.response.edit_message(embed=embed, view=self)
+        return self.pages[self.page]
     
     # async def back_to_overview(self, interaction: discord.Interaction):
     #     await interaction.response.defer()
@@ -254,22 +309,63 @@ class SprintUpdateView(discord.ui.View):
             ))
 
 class LocalBot:
-    def __init__(self, command_prefix="c!"):
+    def __init__(self, command_prefix="c!", trace: Optional[StartupTrace] = None,
+                 store: Optional[ConfigStore] = None):
         self.valid = False
+        # Pass a trace started at the top of main.py to include interpreter and import time
+        self.trace = trace or StartupTrace()
+        self.trace.mark("imports")
 
-        intents = discord.Intents.all()
-
+        # Gateway settings are needed before the client exists, so read the .env early
+        load_dotenv()
         self.command_prefix = command_prefix
-        self.bot = commands.Bot(command_prefix=command_prefix, intents=intents, help_command=None)
+        # One process can serve many guilds, AUTO_SHARD=1 spreads them over several gateway shards
+        bot_class = commands.AutoShardedBot if get_env_int("AUTO_SHARD", 0) else commands.Bot
+        self.bot = bot_class(command_prefix=command_prefix, help_command=None, **self.gateway_options())
+        # Shared pooled session, opened on first use once the event loop exists
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        # Every raw Discord REST call is scheduled through this to respect rate-limit buckets
+        self.discord_limiter = DiscordRateLimiter()
+        # Identical Notion/Discord work requested concurrently runs once, keyed by operation
+        self.single_flight = SingleFlight()
+        self.help_embeds: Dict[FrozenSet[str], discord.Embed] = {}
+        register_cache("single_flight", self.single_flight)
+        # Per-guild state by guild ID, built from the config's guild namespaces
+        self.guild_states: Dict[str, GuildState] = {}
+        # Notion gateways by API key, one per workspace
+        self.notion_gateways: Dict[str, NotionGateway] = {}
+        # Sprint titles, extractors and task lists, keyed by ("title" | "extractor", sprint_id)
+        # or ("tasks", guild_id, sprint_id)
+        self.sprint_cache = TTLCache(maxsize=get_env_int("SPRINT_CACHE_SIZE", 32),
+                                     ttl=get_env_float("SPRINT_CACHE_TTL", 300.0))
+        register_cache("sprint", self.sprint_cache)
+        # Prometheus metrics stay on localhost unless METRICS_HOST says otherwise
+        self.metrics_server = None
+        if os.getenv("METRICS_PORT"):
+            self.metrics_server = MetricsServer(host=os.getenv("METRICS_HOST", "127.0.0.1"),
+                                                port=get_env_int("METRICS_PORT", 9100))
+        self._loop_lag_task: Optional[asyncio.Task] = None
+        # Split mode: sync worker processes that meeting syncs and sprint refreshes are handed to
+        self.workers: Optional[WorkerPool] = None
 
         try:
-            load_dotenv()
             # Fetch required variables
             # self.notion_api_key = get_env_var("NOTION_API_KEY")
-            self.calendar_id = get_env_var("CALENDAR_ID")
             self.bot_token = get_env_var("DISCORD_BOT_TOKEN")
-            self.guild_id = get_env_var("GUILD_ID")
-            self.notion_client = NotionClient(auth=get_env_var("NOTION_API_KEY"))
+            # The default guild, more can be added under "guilds" in the config
+            self.guild_id = os.getenv("GUILD_ID")
+            self.calendar_id = os.getenv("CALENDAR_ID")
+            self.meeting_sync_concurrency = get_env_int("MEETING_SYNC_CONCURRENCY", 5)
+            self.meeting_sync_auto = bool(get_env_int("MEETING_SYNC_AUTO", 1))
+            self.meeting_sync_min_interval = get_env_float("MEETING_SYNC_MIN_INTERVAL", MEETING_SYNC_MIN_INTERVAL)
+            self.meeting_sync_max_interval = get_env_float("MEETING_SYNC_MAX_INTERVAL", MEETING_SYNC_MAX_INTERVAL)
+            self.webhook_receiver = None
+            if os.getenv("WEBHOOK_PORT"):
+                self.webhook_receiver = NotionWebhookReceiver(self.sync_meeting_pages,
+                                                              host=os.getenv("WEBHOOK_HOST", "0.0.0.0"),
+                                                              port=get_env_int("WEBHOOK_PORT", 8080),
+                                                              path=os.getenv("WEBHOOK_PATH", "/notion/webhook"),
+                                                              secret=os.getenv("WEBHOOK_SECRET"))
 
             # Notion and Discord configuration
             # self.notion_headers = {
@@ -283,16 +379,24 @@ class LocalBot:
             }
 
             self.config_file = get_env_var("CONFIG_FILE")
-            if not os.path.exists(self.config_file):
-                self.config = {"last_query_time": "2020-01-01T00:00:00.000Z",
-                               "meeting_dict": {}}
-                self.update_config()
+            self.store = store or open_config_store(self.config_file)
+            self.config = self.store.load()
+            if self.config is None:
+                self.config = {"guilds": {}}
+            self.load_guilds()
+            self.update_config()
+
+            self.sprint_index_max_age = timedelta(hours=get_env_float("SPRINT_INDEX_MAX_AGE_HOURS", 24.0))
 
-            with open(self.config_file, "r") as file:
-                self.config = json.load(file)
-                # Ensure new config keys exist
-                if "last_sprint_reminder" not in self.config:
-                    self.config["last_sprint_reminder"] = None
+            self.dashboards = DashboardSnapshots.from_json(self.config.get("dashboards", {}),
+                                                           limit=get_env_int("DASHBOARD_SNAPSHOT_LIMIT", 25))
+            # Dynamic task page buttons are rebuilt from their custom_id and reach the snapshots through the client
+            self.bot.dashboards = self.dashboards
+            register_dashboards(self.dashboards)
+
+            scheduler_timezone = os.getenv("SCHEDULER_TIMEZONE")
+            self.scheduler = Scheduler(ZoneInfo(scheduler_timezone) if scheduler_timezone else None)
+            self.register_jobs()
 
             self.valid = True
 
@@ -303,82 +407,242 @@ class LocalBot:
         self.add_commands()
 
         self.bot.check(self.global_check)
-        
-    @tasks.loop(hours=1)  # Check every hour
-    async def weekly_sprint_check(self):
-        """Check if it's Friday 6pm and send sprint updates"""
-        try:        
-            now = datetime.now()
-            
-            # Check if it's Friday (weekday 4) and between 6pm-7pm
-            if now.weekday() == 4 and now.hour == 18:  # Friday at 6pm
-                # Check if we already sent this week
-                last_reminder = self.config.get('last_sprint_reminder')
-                if last_reminder:
-                    last_date = datetime.fromisoformat(last_reminder).date()
-                    if last_date == now.date():
-                        return  # Already sent today
-                
-                # Check if channel_dict and Update channel are configured
-                if 'channel_dict' not in self.config:
-                    print("No channel_dict configured for sprint automation")
-                    return
-                    
-                if 'Update' not in self.config['channel_dict']:
-                    print("No 'Update' channel configured in channel_dict")
-                    return
-                
-                # Get the channel
-                channel = self.bot.get_channel(int(self.config['channel_dict']['Update']))
-                if not channel:
-                    print(f"Sprint channel {self.config['channel_dict']['Update']} not found")
-                    return
-                
-                print(f"Sending scheduled sprint update to {channel.name}")
-                
-                # Create a fake context for the commands
-                class FakeContext:
-                    def __init__(self, channel, bot):
-                        self.channel = channel
-                        self.bot = bot
-                        self.guild = channel.guild
-                        
-                    async def send(self, *args, **kwargs):
-                        return await self.channel.send(*args, **kwargs)
-                
-                fake_ctx = FakeContext(channel, self.bot)
-                
-                # Mention Dev Team for the weekly sprint update
-                dev_team_role = discord.utils.get(fake_ctx.guild.roles, name="Dev Team")
-                role_mention = dev_team_role.mention if dev_team_role else "@Dev Team"
-                await fake_ctx.send(f"{role_mention} Weekly sprint update time! 📊")
-                
-                await self.get_sprint_dashboard(fake_ctx)
-                
-                await asyncio.sleep(2)
-                await self.request_update(fake_ctx)
-                
-                self.config['last_sprint_reminder'] = now.isoformat()
-                self.update_config()
-                
-        except Exception as e:
-            print(f"Error in weekly sprint check: {e}")
+        self.trace.mark("init")
+
+    @property
+    def http_session(self) -> aiohttp.ClientSession:
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=HTTP_KEEPALIVE)
+            timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+            self._http_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._http_session
+
+    def get_notion(self, guild_id: str) -> NotionGateway:
+        """Gateway for a guild's Notion workspace, keyed by NOTION_API_KEY_<guild id> or NOTION_API_KEY.
+
+        Guilds on the same integration share its gateway and request budget, while every
+        other workspace gets its own, so a slow one never queues work for the rest.
+        """
+        auth = os.getenv(f"NOTION_API_KEY_{guild_id}") or get_env_var("NOTION_API_KEY")
+        gateway = self.notion_gateways.get(auth)
+        if gateway is None:
+            gateway = self.notion_gateways[auth] = NotionGateway(
+                auth,
+                max_concurrency=get_env_int("NOTION_MAX_CONCURRENCY", 3),
+                timeout=get_env_float("NOTION_TIMEOUT", 10.0),
+                page_size=get_env_int("NOTION_PAGE_SIZE", 100),
+                prefetch=bool(get_env_int("NOTION_PREFETCH", 1)),
+                base_url=os.getenv("NOTION_BASE_URL"))
+        return gateway
+
+    def load_guilds(self):
+        """Build the state of every guild in the config, moving a single-guild config into GUILD_ID's namespace."""
+        migrate_config(self.config, self.guild_id)
+        # Task statuses grouped into dashboard buttons; buttons reach them through the client
+        self.status_buckets = StatusBuckets(self.config.get("status_buckets", DEFAULT_STATUS_BUCKETS))
+        self.bot.status_buckets = self.status_buckets
+        self.guild_states = {}
+        for guild_id, namespace in self.config["guilds"].items():
+            buckets = StatusBuckets(namespace["status_buckets"]) if "status_buckets" in namespace \
+                else self.status_buckets
+            guild = GuildState(guild_id, namespace, self.get_notion(guild_id), buckets,
+                               calendar_id=self.calendar_id if guild_id == self.guild_id else None)
+            guild.meeting_sync_interval = self.meeting_sync_min_interval
+            self.guild_states[guild_id] = guild
+        self.bot.guild_states = self.guild_states
+        if not self.guild_states:
+            raise ValueError("No guild configured, set GUILD_ID or add one under 'guilds' in the config")
+
+    def get_guild_state(self, ctx) -> Optional[GuildState]:
+        """State of the guild a command came from, None in DMs and guilds without a namespace."""
+        return self.guild_states.get(str(ctx.guild.id)) if ctx.guild else None
+
+    async def weekly_sprint_check(self, guild_id: str):
+        """Send the weekly sprint dashboard and update request, scheduled by SPRINT_REMINDER_CRON"""
+        guild = self.guild_states.get(guild_id)
+        if guild is None:
+            return
+        try:
+            # Check if channel_dict and Update channel are configured
+            if 'channel_dict' not in guild.config:
+                print(f"No channel_dict configured for sprint automation in guild {guild_id}")
+                return
+
+            if 'Update' not in guild.config['channel_dict']:
+                print(f"No 'Update' channel configured in channel_dict of guild {guild_id}")
+                return
+
+            # Get the channel
+            channel = self.bot.get_channel(int(guild.config['channel_dict']['Update']))
+            if not channel:
+                print(f"Sprint channel {guild.config['channel_dict']['Update']} not found")
+                return
+
+            print(f"Sending scheduled sprint update to {channel.name}")
 
-    @weekly_sprint_check.before_loop
-    async def before_weekly_sprint_check(self):
-        """Wait until the bot is ready before starting the loop"""
-        await self.bot.wait_until_ready()
+            # Create a fake context for the commands
+            class FakeContext:
+                def __init__(self, channel, bot):
+                    self.channel = channel
+                    self.bot = bot
+                    self.guild = channel.guild
+
+                async def send(self, *args, **kwargs):
+                    return await self.channel.send(*args, **kwargs)
+
+            fake_ctx = FakeContext(channel, self.bot)
+
+            # Mention Dev Team for the weekly sprint update
+            dev_team_role = await self.get_role(fake_ctx.guild, "Dev Team")
+            role_mention = dev_team_role.mention if dev_team_role else "@Dev Team"
+            await fake_ctx.send(f"{role_mention} Weekly sprint update time! 📊")
+
+            await self.get_sprint_dashboard(fake_ctx)
+
+            await asyncio.sleep(2)
+            await self.request_update(fake_ctx)
+
+            guild.config['last_sprint_reminder'] = datetime.now(timezone.utc).isoformat()
+            self.update_config()
+
+        except Exception as e:
+            print(f"Error in weekly sprint check of guild {guild_id}: {e}")
+
+    async def meeting_sync_tick(self, guild_id: str) -> float:
+        """Sync meetings in the background, returning the delay before the next background sync"""
+        guild = self.guild_states.get(guild_id)
+        if guild is None:
+            return self.meeting_sync_max_interval
+        if guild.meeting_sync_lock.locked():
+            # A manual or webhook sync is running, skip this tick instead of queueing behind it
+            changed = 0
+        else:
+            try:
+                changed = await self.process_meetings(guild)
+            except Exception as e:
+                print(f"Error in background meeting sync of guild {guild_id}: {e}")
+                changed = 0
+        return self.next_meeting_sync_interval(guild, changed)
+
+    def register_jobs(self):
+        """Register the bot's periodic jobs with the scheduler, one set per guild.
+
+        Every guild's jobs run as their own scheduler tasks, so a guild whose Notion is slow
+        only delays its own syncs and reminders.
+        """
+        for guild_id, guild in self.guild_states.items():
+            last_reminder = guild.config.get('last_sprint_reminder')
+            self.scheduler.add_cron(f"weekly_sprint_check:{guild_id}",
+                                    os.getenv("SPRINT_REMINDER_CRON", SPRINT_REMINDER_CRON),
+                                    functools.partial(self.weekly_sprint_check, guild_id),
+                                    last_run=parse_event_time(last_reminder) if last_reminder else None,
+                                    catch_up=timedelta(hours=get_env_float("SPRINT_REMINDER_CATCHUP_HOURS", 24.0)))
+            if self.meeting_sync_auto and guild.calendar_id:
+                self.scheduler.add_adaptive(f"meeting_sync:{guild_id}",
+                                            functools.partial(self.meeting_sync_tick, guild_id))
+
+    def next_meeting_sync_interval(self, guild: GuildState, changed: int) -> float:
+        """Seconds until the next background sync.
+
+        Drops to the minimum while the watermark keeps advancing, doubles up to the maximum
+        while the calendar is idle, and tightens again as the next known meeting approaches.
+        """
+        if changed:
+            interval = self.meeting_sync_min_interval
+        else:
+            interval = min(guild.meeting_sync_interval * 2, self.meeting_sync_max_interval)
+
+        next_event = guild.meetings.next_event_time()
+        if next_event is not None:
+            until_event = (next_event - datetime.now(timezone.utc)).total_seconds()
+            if until_event < self.meeting_sync_max_interval:
+                interval = min(interval, max(until_event / 4, self.meeting_sync_min_interval))
+
+        guild.meeting_sync_interval = interval
+        # Jitter so restarts and several bots don't poll Notion in lockstep
+        return interval * random.uniform(1 - MEETING_SYNC_JITTER, 1 + MEETING_SYNC_JITTER)
+
+    @staticmethod
+    def gateway_options() -> Dict:
+        """Client options for the gateway connection, lean unless LEAN_GATEWAY=0.
+
+        Lean mode only asks for the guild, guild message, DM message and message content
+        intents the commands use, caches no members and never chunks guilds, so presences, typing, voice
+        states and member lists are neither received nor kept. Roles still come with the
+        guild, and the author's roles come with each message, so checks keep working.
+        """
+        # With AUTO_SHARD, SHARD_COUNT pins the shard count instead of asking Discord for one
+        shards = {"shard_count": get_env_int("SHARD_COUNT", 0)} if get_env_int("SHARD_COUNT", 0) else {}
+        if not get_env_int("LEAN_GATEWAY", 1):
+            return {"intents": discord.Intents.all(), **shards}
+
+        intents = discord.Intents.none()
+        intents.guilds = True
+        intents.guild_messages = True
+        # c!about and c!help also answer in DMs
+        intents.dm_messages = True
+        intents.message_content = True
+        return {"intents": intents,
+                "member_cache_flags": discord.MemberCacheFlags.none(),
+                "chunk_guilds_at_startup": False,
+                "max_messages": get_env_int("MAX_CACHED_MESSAGES", 100) or None,
+                **shards}
+
+    async def get_role(self, guild: discord.Guild, name: str) -> Optional[discord.Role]:
+        """Look up a guild role by name, asking Discord if it is not cached."""
+        role = discord.utils.get(guild.roles, name=name)
+        if role is None:
+            role = discord.utils.get(await guild.fetch_roles(), name=name)
+        return role
+
+    def get_permissions(self, guild: GuildState, discord_guild: discord.Guild) -> PermissionMatrix:
+        """The guild's permission matrix, from its own "command_roles" or the config-wide default."""
+        if guild.permissions is None:
+            roles_by_name = {role.name: role.id for role in discord_guild.roles}
+            command_roles = guild.config.get("command_roles", self.config.get("command_roles", DEFAULT_COMMAND_ROLES))
+            acl = {name: resolve_role_ids(refs, roles_by_name) for name, refs in command_roles.items()}
+            guild.permissions = PermissionMatrix((command.name for command in self.bot.commands), acl,
+                                                 public=EXCLUDED_COMMANDS)
+        return guild.permissions
+
+    def invalidate_permissions(self, guild: Optional[GuildState] = None):
+        """Drop the permission matrix of one guild, or of every guild."""
+        for state in [guild] if guild else self.guild_states.values():
+            state.permissions = None
+        self.help_embeds.clear()
+
+    async def get_member_role_ids(self, ctx, guild: GuildState) -> FrozenSet[int]:
+        """Role IDs of the command's author, normally straight from the message."""
+        if isinstance(ctx.author, discord.Member):
+            return frozenset(role.id for role in ctx.author.roles)
+        role_ids = guild.member_roles.get(ctx.author.id)
+        if role_ids is None:
+            member = await ctx.guild.fetch_member(ctx.author.id)
+            role_ids = guild.member_roles[ctx.author.id] = frozenset(role.id for role in member.roles)
+        return role_ids
+
+    async def get_allowed_commands(self, ctx) -> FrozenSet[str]:
+        """Names of every command the author may run, one lookup in the guild's permission matrix."""
+        if not self.valid:
+            return frozenset()
+        guild = self.get_guild_state(ctx)
+        if guild is None:
+            # DMs and guilds that were never set up only get the public commands
+            return frozenset(EXCLUDED_COMMANDS)
+        permissions = self.get_permissions(guild, ctx.guild)
+        # owner_id needs no member cache, unlike guild.owner
+        if ctx.author.id == ctx.guild.owner_id:
+            return permissions.everything()
+        return permissions.allowed(await self.get_member_role_ids(ctx, guild))
 
     async def global_check(self, ctx):
         if not self.valid:
             raise commands.CheckFailure("The bot is not valid at the moment")
 
-        if ctx.command.name in EXCLUDED_COMMANDS or (ctx.guild and ctx.author == ctx.guild.owner):
-            return True
-
-        allowed_roles = ["Dev Team"]
-        if any(role.name in allowed_roles for role in ctx.author.roles):
+        if ctx.command.name in await self.get_allowed_commands(ctx):
             return True
+        elif ctx.guild and self.get_guild_state(ctx) is None:
+            raise commands.CheckFailure("This server has not been set up for the bot")
         else:
             raise commands.CheckFailure("You do not have permission to use this command")
 
@@ -386,13 +650,13 @@ class LocalBot:
         self.valid = False
 
         try:
-            load_dotenv()
             # Fetch required variables
             # self.notion_api_key = get_env_var("NOTION_API_KEY")
-            self.calendar_id = get_env_var("CALENDAR_ID")
             self.bot_token = get_env_var("DISCORD_BOT_TOKEN")
-            self.guild_id = get_env_var("GUILD_ID")
-            self.notion_client = NotionClient(auth=get_env_var("NOTION_API_KEY"))
+            self.guild_id = os.getenv("GUILD_ID")
+            self.calendar_id = os.getenv("CALENDAR_ID")
+            self.meeting_sync_concurrency = get_env_int("MEETING_SYNC_CONCURRENCY", 5)
+            self.notion_gateways = {}
 
             # Notion and Discord configuration
             # self.notion_headers = {
@@ -406,16 +670,23 @@ class LocalBot:
             }
 
             self.config_file = get_env_var("CONFIG_FILE")
-            if (not os.path.exists(self.config_file)) or hard:
-                self.config = {"last_query_time": "2020-01-01T00:00:00.000Z",
-                               "meeting_dict": {}}
+            if hasattr(self, 'store'):
+                self.store.flush()
+            self.store = open_config_store(self.config_file)
+            config = self.store.load()
+            if config is None or hard:
+                self.config = {"guilds": {}}
             else:
-                with open(self.config_file, "r") as file:
-                    self.config = json.load(file)
-                    self.config["last_query_time"] = "2020-01-01T00:00:00.000Z"
-                    self.config["Meeting_dict"] = {}
-                    if "last_sprint_reminder" not in self.config:
-                        self.config["last_sprint_reminder"] = None
+                self.config = migrate_config(config, self.guild_id)
+                for namespace in self.config["guilds"].values():
+                    namespace["last_query_time"] = DEFAULT_QUERY_TIME
+                    # Rebuild sprint tasks from scratch on the next dashboard
+                    namespace.pop("sprint_index", None)
+            self.load_guilds()
+            self.sprint_index_max_age = timedelta(hours=get_env_float("SPRINT_INDEX_MAX_AGE_HOURS", 24.0))
+            self.sprint_cache.clear()
+            # The reloaded config may carry a different command ACL
+            self.invalidate_permissions()
             self.update_config()
 
             self.valid = True
@@ -423,136 +694,321 @@ class LocalBot:
         except Exception as e:
             print(e)
 
-    def fetch_new_meetings(self):
-        """Fetch new meetings from the Notion calendar."""
-        response = self.notion_client.databases.query(
-            database_id=self.calendar_id,
-            filter={
-                "timestamp": "last_edited_time",
-                "last_edited_time": {
-                    "after": self.config.get("last_query_time", "2020-01-01T00:00:00.000Z")
-                }
-            }
-        )
-        if response.status_code == 200:
-            self.config["last_query_time"] = datetime.now(timezone.utc).isoformat()
-            self.update_config()
-            return response.json().get("results", [])
-        else:
-            print(f"Error fetching Notion data: {response.status_code}")
-            print(response.text)
-            return []
+    async def fetch_new_meetings(self, guild: GuildState):
+        """Stream pages of meetings edited in the guild's Notion calendar since the last query.
+
+        The watermark only advances once every page has been read, so a failure part way
+        through is retried from the same point on the next sync. Notion rounds
+        ``last_edited_time`` down to the minute, so the watermark is the minute of the query
+        and matched ``on_or_after``; edits later in that minute are picked up next time.
+        """
+        query_time = datetime.now(timezone.utc).replace(second=0, microsecond=0).isoformat()
+        try:
+            async for meetings in guild.notion.iter_query(
+                    guild.calendar_id,
+                    filter={
+                        "timestamp": "last_edited_time",
+                        "last_edited_time": {
+                            "on_or_after": guild.config.get("last_query_time", DEFAULT_QUERY_TIME)
+                        }
+                    }
+            ):
+                yield meetings
+        except notion_errors() as e:
+            print(f"Error fetching Notion data for guild {guild.guild_id}: {e!r}")
+            return
+        # Persisted by the caller together with the synced meetings
+        guild.config["last_query_time"] = query_time
 
-    def modify_discord_event(self, title: str, start_time: str, event_end: str, meeting_type: int, location: str = "",
-                             event_id="") -> \
-            Union[str, None]:
+    async def modify_discord_event(self, guild: GuildState, title: str, start_time: str, event_end: str,
+                                   meeting_type: int, location: str = "", event_id="") -> Union[str, None]:
         """Create a scheduled event in Discord."""
-        event_url = get_discord_event_url(self.guild_id)
+        event_url = get_discord_event_url(guild.guild_id)
         if event_id:
             event_url = '/'.join([event_url, event_id])
         print(event_url)
 
-        # Convert Notion date to ISO format for Discord
-        event_start = datetime.fromisoformat(start_time).astimezone(timezone.utc).isoformat()
-
-        event_data = {
-            "name": title,
-            "scheduled_start_time": event_start,
-            "scheduled_end_time": event_end,
-            "privacy_level": 2,
-            "entity_type": meeting_type
-        }
-
-        if meeting_type == 2:
-            event_data["channel_id"] = location
-        else:
-            event_data["entity_metadata"] = {
-                "location": location
-            }
+        event_data = build_event_data(title, start_time, event_end, meeting_type, location)
 
         print(event_data)
-        if event_id:
-            response = requests.patch(event_url, headers=self.discord_headers, json=event_data)
-        else:
-            response = requests.post(event_url, headers=self.discord_headers, json=event_data)
-        if response.status_code == 200:
+        method = "PATCH" if event_id else "POST"
+        status, body = await self.discord_limiter.request(self.http_session, method, event_url,
+                                                          headers=self.discord_headers, json=event_data)
+        if status == 200:
             print(f"Event '{title}' created successfully!")
-            return response.json()["id"]
+            return body["id"]
         else:
-            print(f"Error creating event: {response.status_code}, {response.text}")
+            print(f"Error creating event: {status}, {body}")
             return None
 
-    async def process_meetings(self):
-        """Process meetings from Notion and create Discord events."""
-        current_time = datetime.now()
-
-        meetings = self.fetch_new_meetings()
-        meeting_dict = self.config["meeting_dict"]
-
-        for meeting in meetings:
-            properties = meeting["properties"]
-            event_time = properties["Event time"]["date"]
-            start_time = event_time["start"]
-            end_time = event_time["end"]
-            if not end_time:
-                time_object = datetime.fromisoformat(start_time.replace("Z", "+00:00")).replace(tzinfo=None)
-                time_object = time_object + timedelta(hours=1)
-                end_time = time_object.isoformat()  # default to one hour if not specified
-            else:
-                time_object = datetime.fromisoformat(end_time.replace("Z", "+00:00")).replace(tzinfo=None)
-            # no point dealing with past event
-            if time_object < current_time:
+    async def process_meetings(self, guild: GuildState) -> int:
+        """Process a guild's meetings from Notion and create Discord events, returning how many changed in Notion.
+
+        Callers arriving while a full sync is already running join it and get its result,
+        instead of queueing a second pass over the same changes.
+        """
+        if not guild.calendar_id:
+            print(f"No calendar configured for guild {guild.guild_id}")
+            return 0
+        if self.workers is not None:
+            return await self.single_flight.do(("meetings", guild.guild_id), lambda: self.sync_meetings_remote(guild))
+        return await self.single_flight.do(("meetings", guild.guild_id),
+                                           lambda: self.sync_meeting_stream(guild, self.fetch_new_meetings(guild)))
+
+    async def sync_meetings_remote(self, guild: GuildState) -> int:
+        """Run a guild's meeting sync in the sync worker that owns the guild."""
+        # Held like a local sync, so background ticks still skip while one runs
+        async with guild.meeting_sync_lock:
+            result = await self.workers.submit(guild.guild_id, "meetings", guild_id=guild.guild_id)
+        self.apply_worker_state(result["guilds"])
+        return result["changed"]
+
+    def apply_worker_state(self, guilds: Dict[str, Dict]):
+        """Take over the config keys sync workers changed, keeping this process the only config writer."""
+        for guild_id, state in guilds.items():
+            guild = self.guild_states.get(guild_id)
+            if guild is None:
                 continue
+            guild.config.update(state)
+            if "meeting_dict" in state:
+                guild.meetings = MeetingIndex.from_json(state["meeting_dict"])
+        if guilds:
+            self.update_config()
 
-            title = ""
-            title_property = properties.get("Name", {}).get("title", [])
-            if title_property:
-                title = " ".join([t["text"]["content"] for t in title_property if "text" in t])
-            meeting_type_name = properties.get("Type", {}).get("select", {}).get("name", "Unknown")
-            meeting_type = 2
-            if meeting_type_name == "External":
-                meeting_type = 3
-                location = properties.get("External link", {})["url"]
-                if not location:
-                    location = "Placeholder link"
+    async def sync_meeting_pages(self, page_ids: Iterable[str]) -> List[str]:
+        """Sync just the given Notion pages, e.g. the ones a webhook reported as changed.
+
+        Pages are looked up through each workspace's gateway in turn and synced for every
+        guild whose calendar they belong to. Returns the IDs of the guilds that were synced.
+        """
+        if self.workers is not None:
+            # Any worker's guilds may own the pages, each one checks its own calendars
+            results = await self.workers.broadcast("meeting_pages", page_ids=list(page_ids))
+            for result in results:
+                self.apply_worker_state(result["guilds"])
+            return [guild_id for result in results for guild_id in result["guilds"]]
+
+        calendars: Dict[str, List[GuildState]] = {}
+        for guild in self.guild_states.values():
+            if guild.calendar_id:
+                calendars.setdefault(guild.calendar_id.replace("-", ""), []).append(guild)
+        gateways = list({id(guild.notion): guild.notion for guilds in calendars.values() for guild in guilds}.values())
+
+        remaining = list(dict.fromkeys(page_ids))
+        errors: Dict[str, Exception] = {}
+        meetings: Dict[str, List[Dict]] = {}
+        for notion in gateways:
+            if not remaining:
+                break
+            pages = await asyncio.gather(*(notion.retrieve_page(page_id) for page_id in remaining),
+                                         return_exceptions=True)
+            missing = []
+            for page_id, page in zip(remaining, pages):
+                if isinstance(page, Exception):
+                    # Possibly a page from another workspace, try the next gateway
+                    errors[page_id] = page
+                    missing.append(page_id)
+                    continue
+                # Callbacks can reference pages from other databases or pages that were just deleted
+                if page.get("archived") or page.get("in_trash"):
+                    continue
+                for guild in calendars.get(page.get("parent", {}).get("database_id", "").replace("-", ""), ()):
+                    meetings.setdefault(guild.guild_id, []).append(page)
+            remaining = missing
+        for page_id in remaining:
+            # Without any configured calendar no gateway was asked at all
+            if page_id in errors:
+                print(f"Error fetching Notion page: {errors[page_id]!r}")
+
+        async def single_page(pages: List[Dict]):
+            yield pages
+
+        await asyncio.gather(*(self.sync_meeting_stream(self.guild_states[guild_id], single_page(pages))
+                               for guild_id, pages in meetings.items()))
+        return list(meetings)
+
+    async def sync_meeting_stream(self, guild: GuildState, pages: AsyncIterator[List[Dict]]) -> int:
+        """Create or update Discord events for every meeting in a stream of Notion result pages.
+
+        Meetings are synced concurrently, at most ``meeting_sync_concurrency`` at a time, as
+        soon as their page arrives. Results are merged into the meeting dict in one step once
+        every meeting has finished. Existing Discord events are read from a single snapshot
+        of the guild's scheduled events and only rewritten when something actually changed.
+        Syncs of the same guild never overlap, so two of them can't both create an event for
+        the same meeting, while other guilds sync alongside.
+        """
+        async with guild.meeting_sync_lock:
+            started = time.perf_counter()
+            current_time = datetime.now(timezone.utc)
+
+            events_task: Optional[asyncio.Future] = None
+            semaphore = asyncio.Semaphore(self.meeting_sync_concurrency)
+            pending: Dict[str, asyncio.Future] = {}
+
+            async def sync_bounded(meeting, previous: Optional[asyncio.Future]):
+                # Keep per-meeting ordering if the same page shows up twice in one sync, and build
+                # on the earlier sync's event since it isn't merged into the meeting dict yet
+                earlier = None
+                if previous is not None:
+                    await asyncio.wait([previous])
+                    if not previous.cancelled() and previous.exception() is None:
+                        earlier = previous.result()
+                events = await events_task
+                async with semaphore:
+                    return await self.sync_meeting(guild, meeting, current_time, events, earlier)
+
+            try:
+                async for meetings in pages:
+                    if events_task is None and meetings:
+                        # Only snapshot Discord once Notion reports something to sync, then share it
+                        events_task = asyncio.ensure_future(self.list_scheduled_events(guild))
+                    if not meetings:
+                        continue
+                    extractor = await self.get_meeting_extractor(guild)
+                    for meeting in extractor.records(meetings):
+                        meeting_id = meeting.id
+                        pending[meeting_id] = asyncio.ensure_future(sync_bounded(meeting, pending.get(meeting_id)))
+            finally:
+                # Also when the stream fails part way: events already written must reach the
+                # meeting dict, or the retry from the old watermark would create them again
+                results = await asyncio.gather(*pending.values(), return_exceptions=True)
+                for meeting_id, result in zip(pending.keys(), results):
+                    if isinstance(result, Exception):
+                        print(f"Error syncing meeting {meeting_id}: {result!r}")
+                    elif result:
+                        guild.meetings.set(meeting_id, *result)
+
+                self.clean_meeting_dict(guild, current_time)
+                guild.config["meeting_dict"] = guild.meetings.to_json()
+                self.update_config()
+                MEETING_SYNC_DURATION.observe(time.perf_counter() - started)
+            return len(pending)
+
+    async def get_meeting_extractor(self, guild: GuildState) -> PropertyExtractor:
+        """Meeting property extractor compiled from the guild's calendar schema on first use."""
+        if guild.meeting_extractor is not None:
+            return guild.meeting_extractor
+
+        async def compile_extractor():
+            try:
+                schema = (await guild.notion.retrieve_database(guild.calendar_id)).get("properties")
+            except notion_errors() as e:
+                print(f"Error fetching the calendar schema, assuming the default one: {e!r}")
+                return PropertyExtractor(MEETING_FIELDS)
+            guild.meeting_extractor = PropertyExtractor(MEETING_FIELDS, schema)
+            return guild.meeting_extractor
+        return await self.single_flight.do(("calendar_schema", guild.guild_id), compile_extractor)
+
+    async def sync_meeting(self, guild: GuildState, meeting, current_time: datetime,
+                           events: Optional[Dict[str, Dict]] = None,
+                           earlier: Optional[Tuple[str, datetime]] = None) -> Optional[Tuple[str, datetime]]:
+        """Create or update the Discord event for one Notion meeting, returning its event ID and start time.
+
+        ``meeting`` is a record from the meeting extractor. ``events`` is the scheduled-event
+        snapshot by ID; without it each known event is fetched on its own. ``earlier`` is the
+        result of a sync of the same meeting earlier in this run, which wins over the meeting dict.
+        """
+        event_time = meeting.event_time
+        if not event_time:
+            print(f"Meeting {meeting.id} has no event time, skipping it")
+            return None
+        start_time = event_time["start"]
+        end_time = event_time["end"]
+        start_at = parse_event_time(start_time)
+        if not end_time:
+            end_at = start_at + timedelta(hours=1)
+            end_time = end_at.replace(tzinfo=None).isoformat()  # default to one hour if not specified
+        else:
+            end_at = parse_event_time(end_time)
+        # no point dealing with past event
+        if end_at < current_time:
+            return None
+
+        title = meeting.title
+        meeting_type_name = meeting.type
+        meeting_type = 2
+        if meeting_type_name == "External":
+            meeting_type = 3
+            location = meeting.link
+            if not location:
+                location = "Placeholder link"
+        else:
+            location = guild.config["channel_dict"][meeting_type_name]
+
+        discord_event_id = ""
+        known = guild.meetings.get(meeting.id)
+        if earlier is not None:
+            # The event snapshot predates that sync, so its event is fetched on its own
+            known = MeetingEntry(*earlier)
+            events = None
+        if known and known.event_time > current_time:
+            if events is not None:
+                discord_event = events.get(known.discord_event_id)
             else:
-                location = self.config["channel_dict"][meeting_type_name]
-
-            meeting_id = meeting["id"]
-            discord_event_id = ""
-            if meeting_id in meeting_dict and datetime.fromisoformat(
-                    meeting_dict[meeting_id]["discord_event_time"]).replace(tzinfo=None) > current_time:
-                discord_event = self.get_scheduled_event(meeting_dict[meeting_id]["discord_event_id"])
-                if discord_event:
-                    discord_event_id = meeting_dict[meeting_id]["discord_event_id"]
-            discord_event_id = self.modify_discord_event(title, start_time, end_time, meeting_type, location,
-                                                         discord_event_id)
-
-            if discord_event_id:
-                self.config["meeting_dict"][meeting_id] = {"discord_event_id": discord_event_id,
-                                                           "discord_event_time": start_time.replace("Z", "+00:00")}
-
-        self.clean_meeting_dict(current_time)
-        self.update_config()
-
-    def get_scheduled_event(self, event_id):
+                discord_event = await self.get_scheduled_event(guild, known.discord_event_id)
+            if discord_event:
+                discord_event_id = known.discord_event_id
+                event_data = build_event_data(title, start_time, end_time, meeting_type, location)
+                if not event_needs_update(discord_event, event_data):
+                    # Discord already matches Notion, nothing to write
+                    return discord_event_id, start_at
+        discord_event_id = await self.modify_discord_event(guild, title, start_time, end_time, meeting_type, location,
+                                                           discord_event_id)
+
+        if discord_event_id:
+            return discord_event_id, start_at
+        return None
+
+    async def list_scheduled_events(self, guild: GuildState) -> Optional[Dict[str, Dict]]:
+        """Fetch every scheduled event in the guild with one request, indexed by event ID."""
+        try:
+            status, body = await self.discord_limiter.request(self.http_session, "GET",
+                                                              get_discord_event_url(guild.guild_id),
+                                                              headers=self.discord_headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching events: {e!r}")
+            return None
+        if status == 200:
+            return {event["id"]: event for event in body}
+        else:
+            print(f"Error fetching events: {status}, {body}")
+            return None
+
+    async def get_scheduled_event(self, guild: GuildState, event_id):
         """Fetch a specific scheduled event by its ID."""
-        url = f"{get_discord_event_url(self.guild_id)}/{event_id}"
+        url = f"{get_discord_event_url(guild.guild_id)}/{event_id}"
 
-        response = requests.get(url, headers=self.discord_headers)
-        if response.status_code == 200:
-            event = response.json()
+        status, body = await self.discord_limiter.request(self.http_session, "GET", url, headers=self.discord_headers)
+        if status == 200:
+            event = body
             return event
         else:
-            print(f"Error fetching event: {response.status_code}, {response.json()}")
+            print(f"Error fetching event: {status}, {body}")
             return None
 
+    async def fetch_public_ip(self, v4: bool = True) -> str:
+        """Public IP from ipify or ifconfig.me, recorded in the API metrics like other outbound calls."""
+        service, url = ("ipify", "https://api4.ipify.org?format=json") if v4 else ("ifconfig.me", "https://ifconfig.me")
+        start = time.perf_counter()
+        status = "error"
+        try:
+            async with self.http_session.get(url) as response:
+                status = str(response.status)
+                if v4:
+                    return (await response.json())['ip']
+                return (await response.text()).strip()
+        except asyncio.TimeoutError:
+            status = "timeout"
+            raise
+        except aiohttp.ClientError as e:
+            status = type(e).__name__
+            raise
+        finally:
+            observe_api_call(service, "GET /", status, time.perf_counter() - start)
+
     async def get_ip(self, ctx, v4=True):
         try:
-            if (v4):
-                received_ip = requests.get("https://api4.ipify.org?format=json").json()['ip']
-            else:
-                received_ip = requests.get("https://ifconfig.me").text.strip()
+            received_ip = await self.fetch_public_ip(v4)
             await ctx.send(received_ip)
         except Exception as e:
             await ctx.send("Error fetching public IP Contact Bill or Cuneyd")
@@ -560,21 +1016,17 @@ class LocalBot:
     async def request_update(self, ctx):
         try:
             # Find the Dev Team role to ping it properly
-            dev_team_role = discord.utils.get(ctx.guild.roles, name="Dev Team")
+            dev_team_role = await self.get_role(ctx.guild, "Dev Team")
             role_mention = dev_team_role.mention if dev_team_role else "@Dev Team"
             
             # Create the embed
-            current_sprint_id = self.config.get('current_sprint_id')
+            guild = self.get_guild_state(ctx)
+            current_sprint_id = guild.current_sprint_id
             if not current_sprint_id:
                 await ctx.send("No current sprint configured.")
                 return
             
-            database_info = self.notion_client.databases.retrieve(database_id=current_sprint_id)
-            
-            sprint_title = "Sprint"
-            if database_info.get("title") and len(database_info["title"]) > 0:
-                sprint_title = database_info["title"][0].get("text", {}).get("content", "Sprint")
-            
+            sprint_title = await self.get_sprint_title(guild, current_sprint_id)
             
             embed = discord.Embed(
                 title=f"{sprint_title} Update",
@@ -582,7 +1034,7 @@ class LocalBot:
                 color=discord.Color.blue()
             )
             
-            view = SprintUpdateView(self.config.get('current_sprint_id', ''))
+            view = SprintUpdateView(current_sprint_id)
             
             await ctx.send(embed=embed, view=view)
         except Exception as e:
@@ -595,8 +1047,9 @@ class LocalBot:
         return
         
         try:
-            previous_sprint_id = self.config['current_sprint_id']
-            previous_sprint = self.notion_client.databases.retrieve(database_id=previous_sprint_id)
+            guild = self.get_guild_state(ctx)
+            previous_sprint_id = guild.config['current_sprint_id']
+            previous_sprint = await guild.notion.retrieve_database(previous_sprint_id)
             
             # Debug: print the parent structure to understand the issue
             print(f"Previous sprint parent structure: {previous_sprint['parent']}")
@@ -636,7 +1089,7 @@ class LocalBot:
             if parent_info["type"] == "block_id":
                 # For block_id parent, create the database directly as a block within the parent block
                 try:
-                    block_response = self.notion_client.blocks.children.append(
+                    block_response = await guild.notion.append_block_children(
                         block_id=parent_info["block_id"],
                         children=[{
                             "type": "database",
@@ -665,13 +1118,13 @@ class LocalBot:
                     print("Falling back to page-level creation...")
                     
                     # Fallback: create at page level
-                    block = self.notion_client.blocks.retrieve(block_id=parent_info["block_id"])
+                    block = await guild.notion.retrieve_block(parent_info["block_id"])
                     if block["parent"]["type"] == "page_id":
                         parent_config = {"type": "page_id", "page_id": block["parent"]["page_id"]}
                     else:
                         parent_config = {"type": "workspace", "workspace": True}
                     
-                    new_sprint = self.notion_client.databases.create(
+                    new_sprint = await guild.notion.create_database(
                         parent=parent_config,
                         title=[{
                             "type": "text",
@@ -688,7 +1141,7 @@ class LocalBot:
                 else:
                     parent_config = parent_info
 
-                new_sprint = self.notion_client.databases.create(
+                new_sprint = await guild.notion.create_database(
                     parent=parent_config,
                     title=[{
                         "type": "text",
@@ -700,7 +1153,7 @@ class LocalBot:
             if not new_sprint or "id" not in new_sprint:
                 raise Exception("Failed to create new sprint database")
                 
-            self.config['current_sprint_id'] = new_sprint["id"]
+            guild.config['current_sprint_id'] = new_sprint["id"]
             
             
             await self.request_update(ctx)
@@ -712,67 +1165,118 @@ class LocalBot:
             print(f"Error type: {type(e)}")
             await ctx.send(f"Error starting a new sprint: {str(e)}")
 
-    async def get_sprint_dashboard(self, ctx):
-        try:
-            current_sprint_id = self.config.get('current_sprint_id')
-            if not current_sprint_id:
-                await ctx.send("No current sprint configured.")
-                return
-
+    async def get_sprint_title(self, guild: GuildState, sprint_id: str) -> str:
+        """Title of a sprint database, served from the sprint cache while fresh."""
+        sprint_title = self.sprint_cache.get(("title", sprint_id))
+        if sprint_title is not None:
+            return sprint_title
+        if self.workers is not None:
+            # The worker fetches the title along with the tasks, in one job
+            await self.single_flight.do(("tasks", guild.guild_id, sprint_id),
+                                        lambda: self.load_sprint_tasks(guild, sprint_id))
+            return self.sprint_cache.get(("title", sprint_id)) or "Sprint"
+        sprint_title, _ = await self.fetch_sprint_database(guild, sprint_id)
+        return sprint_title
+
+    async def get_task_extractor(self, guild: GuildState, sprint_id: str) -> PropertyExtractor:
+        """Task property extractor compiled from the sprint database's schema, cached with its title."""
+        extractor = self.sprint_cache.get(("extractor", sprint_id))
+        if extractor is not None:
+            return extractor
+        _, extractor = await self.fetch_sprint_database(guild, sprint_id)
+        return extractor
+
+    async def fetch_sprint_database(self, guild: GuildState, sprint_id: str) -> Tuple[str, PropertyExtractor]:
+        """Title and task extractor of a sprint database, both from one ``databases.retrieve``."""
+        async def fetch():
             # Get the database info to extract the title
-            database_info = self.notion_client.databases.retrieve(database_id=current_sprint_id)
+            database_info = await guild.notion.retrieve_database(sprint_id)
             sprint_title = "Sprint"
             if database_info.get("title") and len(database_info["title"]) > 0:
                 sprint_title = database_info["title"][0].get("text", {}).get("content", "Sprint")
+            extractor = PropertyExtractor(TASK_FIELDS, database_info.get("properties"))
+            self.sprint_cache.set(("title", sprint_id), sprint_title)
+            self.sprint_cache.set(("extractor", sprint_id), extractor)
+            return sprint_title, extractor
+        return await self.single_flight.do(("database", sprint_id), fetch)
+
+    async def get_sprint_tasks(self, guild: GuildState, sprint_id: str) -> SprintSnapshot:
+        """Snapshot of a sprint's tasks grouped by status bucket, served from the sprint cache while fresh.
+
+        On a cache miss the persistent sprint index is brought up to date with only the tasks
+        edited since its watermark, by the guild's sync worker in split mode. The snapshot is
+        interned with the stored dashboards, so an unchanged sprint hands back the very
+        snapshot earlier dashboards already hold.
+        """
+        cached = self.sprint_cache.get(("tasks", guild.guild_id, sprint_id))
+        if cached is not None:
+            return cached
+        # Concurrent dashboards share one refresh, which also keeps them off the index at the same time
+        return await self.single_flight.do(("tasks", guild.guild_id, sprint_id),
+                                           lambda: self.load_sprint_tasks(guild, sprint_id))
+
+    async def load_sprint_tasks(self, guild: GuildState, sprint_id: str) -> SprintSnapshot:
+        if self.workers is not None:
+            snapshot = await self.refresh_sprint_remote(guild, sprint_id)
+        else:
+            snapshot = await self.refresh_sprint_tasks(guild, sprint_id)
+        snapshot = self.dashboards.intern(snapshot)
+        self.sprint_cache.set(("tasks", guild.guild_id, sprint_id), snapshot)
+        return snapshot
+
+    async def refresh_sprint_remote(self, guild: GuildState, sprint_id: str) -> SprintSnapshot:
+        """Bring the sprint index up to date in the guild's sync worker, which sends back the snapshot."""
+        result = await self.workers.submit(guild.guild_id, "sprint", guild_id=guild.guild_id, sprint_id=sprint_id,
+                                           fetch_database=self.sprint_cache.get(("title", sprint_id)) is None)
+        if result["title"] is not None:
+            self.sprint_cache.set(("title", sprint_id), result["title"])
+        self.apply_worker_state(result["guilds"])
+        return SprintSnapshot.from_json(result["snapshot"])
+
+    async def refresh_sprint_tasks(self, guild: GuildState, sprint_id: str) -> SprintSnapshot:
+        index = guild.sprint_index
+        if index is None or index.sprint_id != sprint_id or index.is_stale(self.sprint_index_max_age):
+            index = SprintTaskIndex(sprint_id)
+
+        query = {"sorts": [{"property": "Status", "direction": "ascending"}]}
+        if index.query_filter():
+            query["filter"] = index.query_filter()
+
+        # Stream every page of edited tasks, folding each page into the index as it lands
+        extractor = await self.get_task_extractor(guild, sprint_id)
+        changed = 0
+        newest = None
+        async for tasks in guild.notion.iter_query(sprint_id, **query):
+            page_changed, page_newest = index.apply(tasks, extractor)
+            changed += page_changed
+            if page_newest and (not newest or page_newest > newest):
+                newest = page_newest
+        # Pages come sorted by status, so a failure part way through must not skip unread edits
+        index.advance(newest)
+
+        if index is not guild.sprint_index or changed:
+            guild.sprint_index = index
+            guild.config["sprint_index"] = index.to_json()
+            self.update_config()
 
-            # Query the current sprint database for all tasks
-            response = self.notion_client.databases.query(
-                database_id=current_sprint_id,
-                sorts=[
-                    {
-                        "property": "Status",
-                        "direction": "ascending"
-                    }
-                ]
-            )
+        return index.snapshot(guild.status_buckets)
 
-            tasks = response.get("results", [])
-            
-            # Organize tasks by status with proper format for buttons
-            completed_tasks = []
-            in_progress_tasks = []
-            blocked_tasks = []
+    def invalidate_sprint_cache(self, guild: GuildState, sprint_id: Optional[str]):
+        """Drop cached metadata and the guild's tasks for a sprint."""
+        self.sprint_cache.invalidate(("title", sprint_id))
+        self.sprint_cache.invalidate(("extractor", sprint_id))
+        self.sprint_cache.invalidate(("tasks", guild.guild_id, sprint_id))
 
-            for task in tasks:
-                properties = task["properties"]
-                
-                # Get task name
-                name_property = properties.get("Name", {}).get("title", [])
-                task_name = " ".join([t["text"]["content"] for t in name_property if "text" in t]) if name_property else "Untitled"
-                
-                # Get task status
-                status_property = properties.get("Status", {}).get("select")
-                status = status_property.get("name", "Unknown") if status_property else "Unknown"
-                
-                # Get task owner(s)
-                assigned_property = properties.get("Assigned To", {}).get("people", [])
-                owners = [person.get("name", "Unknown") for person in assigned_property] if assigned_property else ["Unassigned"]
-                owner_text = ", ".join(owners)
-                
-                # Create task data for buttons
-                task_url = f"https://www.notion.so/{task['id'].replace('-', '')}"
-                task_data = {
-                    'name': f"{task_name} | {owner_text}",
-                    'url': task_url
-                }
-
-                # Categorize by status
-                if status.lower() == "complete":
-                    completed_tasks.append(task_data)
-                elif status.lower() == "in progress":
-                    in_progress_tasks.append(task_data)
-                elif status.lower() == "blocked":
-                    blocked_tasks.append(task_data)
+    async def get_sprint_dashboard(self, ctx):
+        try:
+            guild = self.get_guild_state(ctx)
+            current_sprint_id = guild.current_sprint_id
+            if not current_sprint_id:
+                await ctx.send("No current sprint configured.")
+                return
+
+            sprint_title = await self.get_sprint_title(guild, current_sprint_id)
+            snapshot = await self.get_sprint_tasks(guild, current_sprint_id)
 
             # Create the main overview embed
             embed = discord.Embed(
@@ -782,33 +1286,22 @@ class LocalBot:
                 timestamp=datetime.now()
             )
 
-            embed.add_field(
-                name="✅ Completed",
-                value=f"{len(completed_tasks)} tasks",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🔄 In Progress", 
-                value=f"{len(in_progress_tasks)} tasks",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🚫 Blocked",
-                value=f"{len(blocked_tasks)} tasks", 
-                inline=True
-            )
+            for bucket in guild.status_buckets:
+                embed.add_field(
+                    name=f"{bucket.emoji} {bucket.label.removesuffix(' Tasks')}".strip(),
+                    value=f"{len(snapshot.categories.get(bucket.key, ()))} tasks",
+                    inline=True
+                )
 
             # Create the interactive dashboard view
-            view = SprintDashboardView(
-                current_sprint_id, 
-                completed_tasks, 
-                in_progress_tasks, 
-                blocked_tasks
-            )
+            view = SprintDashboardView(guild.status_buckets, current_sprint_id)
 
-            await ctx.send(embed=embed, view=view)
+            message = await ctx.send(embed=embed, view=view)
+
+            # Keep the snapshot behind this message so its buttons work without Notion, even after a restart
+            self.dashboards.add(message.id, snapshot)
+            self.config["dashboards"] = self.dashboards.to_json()
+            self.update_config()
 
         except Exception as e:
             print(e)
@@ -820,7 +1313,10 @@ class LocalBot:
                 await ctx.send("No sprint id provided")
                 return
             
-            self.config['current_sprint_id'] = sprint_id
+            guild = self.get_guild_state(ctx)
+            self.invalidate_sprint_cache(guild, guild.current_sprint_id)
+            self.invalidate_sprint_cache(guild, sprint_id)
+            guild.config['current_sprint_id'] = sprint_id
             self.update_config()
             await ctx.send(f"Updated current sprint to {sprint_id}")
         except Exception as e:
@@ -830,31 +1326,90 @@ class LocalBot:
     async def get_about(self, ctx):
         await ctx.send("Welcome to Lunaboot Studio")
 
-    def clean_meeting_dict(self, current_time):
-        meeting_dict: Dict = self.config["meeting_dict"]
-        deleting_id = []
-        for meeting_id, discord_event_info in meeting_dict.items():
-            if datetime.fromisoformat(discord_event_info["discord_event_time"]).replace(tzinfo=None) < current_time:
-                deleting_id.append(meeting_id)
-        for meeting_id in deleting_id:
-            meeting_dict.pop(meeting_id)
+    def clean_meeting_dict(self, guild: GuildState, current_time: datetime):
+        """Forget meetings whose event has already started."""
+        guild.meetings.pop_expired(current_time)
 
     def update_config(self):
-        with open(self.config_file, "w") as file:
-            json.dump(self.config, file, indent=4)
+        """Queue the config for a debounced, atomic write-behind flush."""
+        self.store.save(self.config)
+
+    def register_views(self):
+        """Re-attach persistent dashboard and task page buttons from earlier runs."""
+        if not self.valid:
+            return
+        self.bot.add_dynamic_items(SprintCategoryButton, TaskPageButton)
 
     def add_listeners(self):
         """Add event listeners to the bot."""
 
+        @self.bot.event
+        async def on_connect():
+            self.trace.mark("connected")
+
         @self.bot.event
         async def on_ready():
             print(f"Talking Cactus is ready! Logged in as {self.bot.user}. Bot uses {self.bot.command_prefix} as prefix.")
-            # Start the sprint check loop when the bot is ready
-            self.weekly_sprint_check.start()
+            print(f"Serving {len(self.bot.guilds)} guilds, {len(self.guild_states)} configured, "
+                  f"over {self.bot.shard_count or 1} shards")
+            if self.trace.elapsed("ready") is None:
+                self.trace.mark("ready")
+                print(self.trace.report())
+                print(f"Resident memory {get_rss_bytes() / 2 ** 20:.1f} MiB, "
+                      f"intents {self.bot.intents.value:#x}, {len(self.bot.users)} cached users")
+            # Start the scheduled jobs when the bot is ready, on_ready fires again after reconnects
+            if self.valid and not self.scheduler.is_running():
+                self.scheduler.start()
+            # Webhooks are only bound once the gateway is up, keeping them off the login path
+            if getattr(self, 'webhook_receiver', None) and not self.webhook_receiver.is_running():
+                await self.webhook_receiver.start()
+            if self.metrics_server and not self.metrics_server.is_running():
+                await self.metrics_server.start()
+            if self._loop_lag_task is None:
+                self._loop_lag_task = asyncio.ensure_future(monitor_loop_lag())
+
+        @self.bot.event
+        async def on_member_update(before, after):
+            # Only delivered with the members intent, lean mode reads roles from each message instead
+            guild = self.guild_states.get(str(after.guild.id))
+            if guild and before.roles != after.roles:
+                guild.member_roles.pop(after.id, None)
+
+        @self.bot.event
+        async def on_guild_role_create(role):
+            guild = self.guild_states.get(str(role.guild.id))
+            if guild:
+                self.invalidate_permissions(guild)
+
+        @self.bot.event
+        async def on_guild_role_update(before, after):
+            # ACL entries given by name can point at a different role after a rename
+            guild = self.guild_states.get(str(after.guild.id))
+            if guild and before.name != after.name:
+                self.invalidate_permissions(guild)
+
+        @self.bot.event
+        async def on_guild_role_delete(role):
+            guild = self.guild_states.get(str(role.guild.id))
+            if guild:
+                self.invalidate_permissions(guild)
+                guild.member_roles.clear()
+
+        @self.bot.before_invoke
+        async def start_command_timer(ctx):
+            ctx.started_at = time.perf_counter()
+
+        @self.bot.after_invoke
+        async def record_command_latency(ctx):
+            # Runs after failed commands too, checks that fail never start the timer
+            COMMAND_LATENCY.observe(time.perf_counter() - ctx.started_at, command=ctx.command.qualified_name,
+                                    outcome="error" if ctx.command_failed else "ok")
 
         @self.bot.event
         async def on_command_error(ctx, error):
             """Handle command errors."""
+            COMMAND_ERRORS.inc(command=ctx.command.qualified_name if ctx.command else "",
+                               error=type(error).__name__)
             if isinstance(error, commands.CommandNotFound):
                 await ctx.send(f"Command not found. Use `{self.bot.command_prefix}help` to see available commands.")
             elif isinstance(error, commands.CheckFailure):
@@ -865,7 +1420,7 @@ class LocalBot:
     def add_commands(self):
         @self.bot.command(name="meeting", aliases=["pull_meeting"], help="Updates discord event with Notion meetings.")
         async def pull_meeting(ctx):
-            await self.process_meetings()
+            await self.process_meetings(self.get_guild_state(ctx))
             await ctx.send("Discord Event Updated")
 
         @self.bot.command(name="ip", aliases=["cuneyd_ip"], help="Get the current public IP on Cuneyd's server, no need to bother Cuneyd")
@@ -898,59 +1453,96 @@ class LocalBot:
 
         @self.bot.command(name="help", help="Displays the help information")
         async def custom_help(ctx):
-            embed = discord.Embed(title="Bot Commands", description="Here are the commands you can use:",
-                                  color=discord.Color.blue())
-
-            # Define command categories
-            sprint_commands = ["sprint_dashboard", "start_new_sprint", "update_sprint_id", "sprint_update"]
-            server_commands = ["ip", "ipv6"]
-            meeting_commands = ["meeting"]
-            general_commands = ["about", "help"]
-
-            # Group commands by category
-            categorized_commands = {
-                "🏃 Sprint Commands": [],
-                "🖥️ Server Commands": [],
-                "📅 Meeting Commands": [],
-                "ℹ️ General Commands": []
-            }
+            # The embed only depends on which commands the author may run, so members with the same permissions share it
+            allowed = await self.get_allowed_commands(ctx)
+            embed = self.help_embeds.get(allowed)
+            if embed is None:
+                embed = self.help_embeds[allowed] = self.render_help(allowed)
+            await ctx.send(embed=embed)
 
-            for command in self.bot.commands:
-                try:
-                    if await command.can_run(ctx):  # Check if user has permission for the command
-                        command_info = f"**c!{command.name}** - {command.help or 'No description'}"
-                        
-                        if command.name in sprint_commands:
-                            categorized_commands["🏃 Sprint Commands"].append(command_info)
-                        elif command.name in server_commands:
-                            categorized_commands["🖥️ Server Commands"].append(command_info)
-                        elif command.name in meeting_commands:
-                            categorized_commands["📅 Meeting Commands"].append(command_info)
-                        elif command.name in general_commands:
-                            categorized_commands["ℹ️ General Commands"].append(command_info)
-                        else:
-                            categorized_commands["ℹ️ General Commands"].append(command_info)
-                except commands.CheckFailure:
-                    pass
-
-            # Add fields for each category that has commands
-            for category, commands in categorized_commands.items():
-                if commands:  # Only add if there are commands in this category
-                    embed.add_field(
-                        name=category,
-                        value="\n".join(commands),
-                        inline=False
-                    )
+    def render_help(self, allowed: FrozenSet[str]) -> discord.Embed:
+        embed = discord.Embed(title="Bot Commands", description="Here are the commands you can use:",
+                              color=discord.Color.blue())
+
+        # Define command categories
+        sprint_commands = ["sprint_dashboard", "start_new_sprint", "update_sprint_id", "sprint_update"]
+        server_commands = ["ip", "ipv6"]
+        meeting_commands = ["meeting"]
+        general_commands = ["about", "help"]
+
+        # Group commands by category
+        categorized_commands = {
+            "🏃 Sprint Commands": [],
+            "🖥️ Server Commands": [],
+            "📅 Meeting Commands": [],
+            "ℹ️ General Commands": []
+        }
 
-            await ctx.send(embed=embed)
+        for command in self.bot.commands:
+            if command.name in allowed:  # Check if user has permission for the command
+                command_info = f"**c!{command.name}** - {command.help or 'No description'}"
+
+                if command.name in sprint_commands:
+                    categorized_commands["🏃 Sprint Commands"].append(command_info)
+                elif command.name in server_commands:
+                    categorized_commands["🖥️ Server Commands"].append(command_info)
+                elif command.name in meeting_commands:
+                    categorized_commands["📅 Meeting Commands"].append(command_info)
+                elif command.name in general_commands:
+                    categorized_commands["ℹ️ General Commands"].append(command_info)
+                else:
+                    categorized_commands["ℹ️ General Commands"].append(command_info)
+
+        # Add fields for each category that has commands
+        for category, category_commands in categorized_commands.items():
+            if category_commands:  # Only add if there are commands in this category
+                embed.add_field(
+                    name=category,
+                    value="\n".join(category_commands),
+                    inline=False
+                )
+        return embed
 
     def run(self):
         """Run the bot."""
+        async def runner():
+            # refresh.sh and kill.sh stop the bot with SIGTERM, close it so the cleanup below still runs
+            with contextlib.suppress(NotImplementedError):
+                asyncio.get_running_loop().add_signal_handler(
+                    signal.SIGTERM, lambda: asyncio.ensure_future(self.bot.close()))
+            try:
+                if self.workers is not None and not self.workers.is_running():
+                    self.workers.start()
+                async with self.bot:
+                    self.register_views()
+                    await self.bot.start(self.bot_token)
+            finally:
+                if self._loop_lag_task is not None:
+                    self._loop_lag_task.cancel()
+                    self._loop_lag_task = None
+                if self.metrics_server:
+                    await self.metrics_server.stop()
+                if getattr(self, 'webhook_receiver', None):
+                    await self.webhook_receiver.stop()
+                if self.workers is not None and self.workers.is_running():
+                    await asyncio.get_running_loop().run_in_executor(None, self.workers.stop)
+                if self._http_session is not None:
+                    await self._http_session.close()
+                    self._http_session = None
+                for notion in self.notion_gateways.values():
+                    await notion.aclose()
+                if hasattr(self, 'store'):
+                    await self.store.aflush()
+
+        # Mirror the logging setup commands.Bot.run would have done for us
+        discord.utils.setup_logging()
         try:
-            self.bot.run(self.bot_token)
+            asyncio.run(runner())
+        except KeyboardInterrupt:
+            pass
         finally:
-            if hasattr(self, 'weekly_sprint_check'):
-                self.weekly_sprint_check.cancel()
+            if hasattr(self, 'scheduler'):
+                self.scheduler.stop()
 
 
 if __name__ == "__main__":
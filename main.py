@@ -1,5 +1,17 @@
+import time
+
+# Taken before anything heavy is imported, so the startup trace covers imports too
+PROCESS_START = time.monotonic()
+
 from local_bot import LocalBot
+from util.startup import StartupTrace
+from util.util import get_env_float, get_env_int
 
 if __name__ == "__main__":
-    bot = LocalBot('c!')
-    bot.run()
\ No newline at end of file
+    bot = LocalBot('c!', trace=StartupTrace(PROCESS_START))
+    # Split mode: SYNC_WORKERS=N moves Notion and meeting sync work into N worker processes
+    sync_workers = get_env_int("SYNC_WORKERS", 0)
+    if sync_workers and bot.valid:
+        from sync_worker import create_worker_pool
+        bot.workers = create_worker_pool(bot, sync_workers, timeout=get_env_float("SYNC_WORKER_TIMEOUT", 120.0))
+    bot.run()
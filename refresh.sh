@@ -22,9 +22,17 @@ echo "[refresh] Activating venv…"
 # shellcheck disable=SC1091
 source "$VENV_DIR/bin/activate"
 
-echo "[refresh] Installing deps…"
-pip install --upgrade pip
-pip install -r requirements.txt
+# Only reinstall when requirements.txt changed since the last successful install
+REQ_HASH_FILE="$VENV_DIR/.requirements.sha256"
+req_hash=$(sha256sum requirements.txt | cut -d' ' -f1)
+if [[ "${FORCE_PIP:-0}" == "1" || ! -f "$REQ_HASH_FILE" || "$(cat "$REQ_HASH_FILE")" != "$req_hash" ]]; then
+  echo "[refresh] Installing deps…"
+  pip install --upgrade pip
+  pip install -r requirements.txt
+  echo "$req_hash" > "$REQ_HASH_FILE"
+else
+  echo "[refresh] Requirements unchanged, skipping pip install"
+fi
 
 echo "[refresh] Stopping existing bot…"
 pids=$(pgrep -f "python3 .*${PY_MAIN}" || true)
@@ -0,0 +1,116 @@
+"""Sync worker processes for split mode.
+
+With ``SYNC_WORKERS`` set, ``main.py`` keeps the Discord gateway, commands and config
+writes in its own process and starts that many of these workers. Each one runs a
+gateway-less ``LocalBot`` over a copy of the config and owns a stable share of the
+guilds, doing their Notion queries, meeting syncs and sprint index updates on its own
+core and event loop. Results come back as the config keys that changed, which the
+gateway process merges and saves.
+
+Every reply, failed jobs included, also carries the counter and histogram increments
+the job left in the worker's metrics registry. The gateway adds them to its own, so its
+``/metrics`` keeps reporting API calls and sync durations in split mode and workers need
+no port of their own. Gauges read at scrape time, such as the cache ones, describe the
+gateway process only.
+"""
+import asyncio
+import multiprocessing
+import queue
+from typing import Any, Dict, List
+
+from local_bot import LocalBot
+from util.metrics import REGISTRY
+from util.store import MemoryConfigStore
+from util.workers import WorkerPool, worker_index
+
+# Config keys a job may change, sent back for the gateway process to save
+MEETING_KEYS = ("last_query_time", "meeting_dict")
+# Seconds between checks that the gateway process is still there while idle
+PARENT_CHECK_INTERVAL = 1.0
+
+
+class SyncWorker:
+    def __init__(self, index: int, count: int, command_prefix: str, config: Dict):
+        self.bot = LocalBot(command_prefix, store=MemoryConfigStore(config))
+        # Only keep the guilds the pool routes here
+        self.bot.guild_states = {guild_id: guild for guild_id, guild in self.bot.guild_states.items()
+                                 if worker_index(guild_id, count) == index}
+        self.handlers = {
+            "meetings": self.sync_meetings,
+            "meeting_pages": self.sync_meeting_pages,
+            "sprint": self.refresh_sprint,
+        }
+
+    def meeting_state(self, guild_ids: List[str]) -> Dict[str, Dict]:
+        return {guild_id: {key: self.bot.guild_states[guild_id].config[key] for key in MEETING_KEYS}
+                for guild_id in guild_ids}
+
+    async def sync_meetings(self, guild_id: str) -> Dict:
+        changed = await self.bot.process_meetings(self.bot.guild_states[guild_id])
+        return {"changed": changed, "guilds": self.meeting_state([guild_id])}
+
+    async def sync_meeting_pages(self, page_ids: List[str]) -> Dict:
+        guild_ids = await self.bot.sync_meeting_pages(page_ids)
+        return {"guilds": self.meeting_state(guild_ids)}
+
+    async def refresh_sprint(self, guild_id: str, sprint_id: str, fetch_database: bool) -> Dict:
+        guild = self.bot.guild_states[guild_id]
+        title = None
+        if fetch_database:
+            title, _ = await self.bot.fetch_sprint_database(guild, sprint_id)
+        index_before = guild.config.get("sprint_index")
+        snapshot = await self.bot.refresh_sprint_tasks(guild, sprint_id)
+        changed = guild.config.get("sprint_index") is not index_before
+        return {"title": title, "snapshot": snapshot.to_json(),
+                "guilds": {guild_id: {"sprint_index": guild.config["sprint_index"]}} if changed else {}}
+
+    async def handle(self, job_id: int, kind: str, kwargs: Dict[str, Any], responses):
+        try:
+            result = await self.handlers[kind](**kwargs)
+        except Exception as e:
+            print(f"Error in sync worker job {kind}: {e!r}")
+            responses.put((job_id, repr(e), None, REGISTRY.take_deltas()))
+        else:
+            responses.put((job_id, None, result, REGISTRY.take_deltas()))
+
+    async def serve(self, requests, responses):
+        loop = asyncio.get_running_loop()
+        parent = multiprocessing.parent_process()
+        jobs = set()
+        try:
+            while True:
+                try:
+                    request = await loop.run_in_executor(None, requests.get, True, PARENT_CHECK_INTERVAL)
+                except queue.Empty:
+                    # A gateway killed outright never sends the stop request, don't outlive it
+                    if parent is not None and not parent.is_alive():
+                        print("Gateway process is gone, stopping sync worker")
+                        responses.cancel_join_thread()
+                        break
+                    continue
+                if request is None:
+                    break
+                job = asyncio.ensure_future(self.handle(*request, responses))
+                jobs.add(job)
+                job.add_done_callback(jobs.discard)
+            await asyncio.gather(*jobs)
+        finally:
+            if self.bot._http_session is not None:
+                await self.bot._http_session.close()
+            for notion in self.bot.notion_gateways.values():
+                await notion.aclose()
+
+
+def run_worker(index: int, count: int, command_prefix: str, config: Dict, requests, responses):
+    """Process entry point of one sync worker."""
+    worker = SyncWorker(index, count, command_prefix, config)
+    try:
+        asyncio.run(worker.serve(requests, responses))
+    except KeyboardInterrupt:
+        pass
+
+
+def create_worker_pool(bot: LocalBot, count: int, timeout: float = 120.0) -> WorkerPool:
+    """Worker pool for ``bot``; workers start from the config as it is when they are (re)started."""
+    return WorkerPool(run_worker, count, lambda index: (index, count, bot.command_prefix, bot.config),
+                      timeout=timeout)
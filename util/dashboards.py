@@ -0,0 +1,83 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from util.sprint_index import SprintSnapshot, TaskRecord
+
+
+class DashboardSnapshots:
+    """Sprint snapshot behind each posted sprint dashboard, keyed by the dashboard's message ID.
+
+    Dashboard buttons are persistent, so a click on any still-stored dashboard, even one
+    posted before a restart, is answered from this local copy instead of Notion. Only the
+    ``limit`` most recent dashboards are kept. Snapshots are interned by sprint ID and
+    version, so dashboards posted while nothing changed share one snapshot, its rendered
+    pages and a single entry in the saved config.
+    """
+
+    def __init__(self, limit: int = 25):
+        self.limit = limit
+        self._messages: "OrderedDict[str, SprintSnapshot]" = OrderedDict()
+        self._snapshots: Dict[Tuple[str, str], SprintSnapshot] = {}
+
+    @classmethod
+    def from_json(cls, data: Dict, limit: int = 25) -> "DashboardSnapshots":
+        dashboards = cls(limit)
+        if "messages" not in data:
+            # Older layout, one full task list per message
+            for message_id, entry in data.items():
+                snapshot = SprintSnapshot(entry["sprint_id"], f"message:{message_id}", {
+                    category: tuple(TaskRecord(task["name"], task["url"]) for task in tasks)
+                    for category, tasks in entry["tasks"].items()})
+                dashboards.add(message_id, snapshot)
+            return dashboards
+
+        snapshots = {key: SprintSnapshot.from_json(snapshot) for key, snapshot in data["snapshots"].items()}
+        for message_id, key in data["messages"].items():
+            if key in snapshots:
+                dashboards.add(message_id, snapshots[key])
+        return dashboards
+
+    def to_json(self) -> Dict:
+        snapshots = {}
+        messages = {}
+        for message_id, snapshot in self._messages.items():
+            key = f"{snapshot.sprint_id}:{snapshot.version}"
+            if key not in snapshots:
+                snapshots[key] = snapshot.to_json()
+            messages[message_id] = key
+        return {"messages": messages, "snapshots": snapshots}
+
+    def intern(self, snapshot: SprintSnapshot) -> SprintSnapshot:
+        """The stored snapshot with the same sprint ID and version, or ``snapshot`` itself."""
+        return self._snapshots.setdefault(snapshot.key, snapshot)
+
+    def add(self, message_id: int, snapshot: SprintSnapshot):
+        self._messages[str(message_id)] = self.intern(snapshot)
+        self._evict()
+
+    def get(self, message_id: int) -> Optional[SprintSnapshot]:
+        return self._messages.get(str(message_id))
+
+    def get_pages(self, message_id: int, category: str,
+                  render: Callable[[Tuple[TaskRecord, ...]], tuple]) -> Optional[tuple]:
+        """Rendered pages for one category of a dashboard, rendering them on first use."""
+        snapshot = self.get(message_id)
+        if snapshot is None:
+            return None
+        if category not in snapshot.pages:
+            snapshot.pages[category] = render(snapshot.categories.get(category, ()))
+        return snapshot.pages[category]
+
+    def memory_size(self) -> int:
+        """Approximate bytes of task data held for all stored dashboards."""
+        return sum(snapshot.memory_size() for snapshot in self._snapshots.values())
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def _evict(self):
+        while len(self._messages) > self.limit:
+            self._messages.popitem(last=False)
+        in_use = {snapshot.key for snapshot in self._messages.values()}
+        for key in self._snapshots.keys() - in_use:
+            del self._snapshots[key]
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Dict, FrozenSet, Optional
+
+from util.meeting_index import MeetingIndex
+from util.notion import NotionGateway
+from util.notion_schema import PropertyExtractor
+from util.permissions import PermissionMatrix
+from util.sprint_index import SprintTaskIndex, StatusBuckets
+
+DEFAULT_QUERY_TIME = "2020-01-01T00:00:00.000Z"
+
+# Config keys that belong to one guild; single-guild configs kept them at the top level
+GUILD_CONFIG_KEYS = ("calendar_id", "last_query_time", "meeting_dict", "last_sprint_reminder",
+                     "current_sprint_id", "channel_dict", "sprint_index")
+
+
+def migrate_config(config: Dict, default_guild_id: Optional[str]) -> Dict:
+    """Give ``config`` a ``guilds`` namespace, moving a single-guild config into the default guild's.
+
+    ``command_roles`` and ``status_buckets`` stay at the top level, where they are the
+    defaults for every guild that doesn't set its own.
+    """
+    if "guilds" not in config and default_guild_id:
+        config["guilds"] = {default_guild_id: {key: config.pop(key) for key in GUILD_CONFIG_KEYS if key in config}}
+    elif "guilds" not in config:
+        config["guilds"] = {}
+    elif default_guild_id:
+        config["guilds"].setdefault(default_guild_id, {})
+    return config
+
+
+class GuildState:
+    """Everything the bot keeps for one guild.
+
+    ``config`` is the guild's namespace inside the shared config, so saving the config
+    saves it too. Each guild has its own calendar, sprint, meeting index, permission
+    matrix and sync lock, and its Notion calls go through the gateway for its workspace,
+    so a slow workspace only ever holds up its own guild.
+    """
+
+    def __init__(self, guild_id: str, config: Dict, notion: NotionGateway, status_buckets: StatusBuckets,
+                 calendar_id: Optional[str] = None):
+        self.guild_id = guild_id
+        self.config = config
+        self.config.setdefault("last_query_time", DEFAULT_QUERY_TIME)
+        self.config.setdefault("meeting_dict", {})
+        self.config.setdefault("last_sprint_reminder", None)
+        self.notion = notion
+        self.status_buckets = status_buckets
+        # The namespace wins, CALENDAR_ID only fills in for the default guild
+        self.calendar_id: Optional[str] = self.config.get("calendar_id") or calendar_id
+
+        self.meetings = MeetingIndex.from_json(self.config["meeting_dict"])
+        self.meeting_sync_lock = asyncio.Lock()
+        self.meeting_sync_interval = 0.0
+        # Compiled against the calendar schema on the first sync
+        self.meeting_extractor: Optional[PropertyExtractor] = None
+
+        self.sprint_index: Optional[SprintTaskIndex] = None
+        if self.config.get("sprint_index"):
+            self.sprint_index = SprintTaskIndex.from_json(self.config["sprint_index"])
+
+        # Built from the command ACL on first use and dropped whenever roles or the ACL change
+        self.permissions: Optional[PermissionMatrix] = None
+        # Role IDs of members we had to fetch because the message carried none
+        self.member_roles: Dict[int, FrozenSet[int]] = {}
+
+    @property
+    def current_sprint_id(self) -> Optional[str]:
+        return self.config.get("current_sprint_id")
+
+    def __repr__(self) -> str:
+        return f"GuildState({self.guild_id!r}, calendar_id={self.calendar_id!r})"
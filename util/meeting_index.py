@@ -0,0 +1,85 @@
+import heapq
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def parse_event_time(value: str) -> datetime:
+    """Parse a Notion/Discord ISO time into an aware datetime, reading offset-less times as local."""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.astimezone()
+
+
+class MeetingEntry:
+    __slots__ = ("discord_event_id", "event_time")
+
+    def __init__(self, discord_event_id: str, event_time: datetime):
+        self.discord_event_id = discord_event_id
+        self.event_time = event_time
+
+
+class MeetingIndex:
+    """Meetings synced to Discord, with parsed event times and a min-heap ordered by them.
+
+    Expiry pops only the entries that are actually past instead of scanning every meeting.
+    Replaced or removed entries are left in the heap and skipped when they surface.
+    Serialises to and from the ``meeting_dict`` JSON layout kept in the config.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, MeetingEntry] = {}
+        self._heap: List[Tuple[datetime, int, str, MeetingEntry]] = []
+        self._counter = 0
+
+    @classmethod
+    def from_json(cls, meeting_dict: Dict) -> "MeetingIndex":
+        index = cls()
+        for meeting_id, info in meeting_dict.items():
+            index.set(meeting_id, info["discord_event_id"], parse_event_time(info["discord_event_time"]))
+        return index
+
+    def to_json(self) -> Dict:
+        return {meeting_id: {"discord_event_id": entry.discord_event_id,
+                             "discord_event_time": entry.event_time.isoformat()}
+                for meeting_id, entry in self._entries.items()}
+
+    def get(self, meeting_id: str) -> Optional[MeetingEntry]:
+        return self._entries.get(meeting_id)
+
+    def set(self, meeting_id: str, discord_event_id: str, event_time: datetime):
+        entry = MeetingEntry(discord_event_id, event_time)
+        self._entries[meeting_id] = entry
+        self._counter += 1
+        heapq.heappush(self._heap, (event_time, self._counter, meeting_id, entry))
+
+    def _drop_stale(self):
+        while self._heap and self._entries.get(self._heap[0][2]) is not self._heap[0][3]:
+            heapq.heappop(self._heap)
+
+    def pop_expired(self, now: datetime) -> List[str]:
+        """Remove and return the meetings whose event time is before ``now``."""
+        expired = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] < now:
+            _, _, meeting_id, _ = heapq.heappop(self._heap)
+            del self._entries[meeting_id]
+            expired.append(meeting_id)
+            self._drop_stale()
+        return expired
+
+    def next_event_time(self) -> Optional[datetime]:
+        """Event time of the earliest meeting still in the index."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def clear(self):
+        self._entries.clear()
+        self._heap.clear()
+
+    def __contains__(self, meeting_id: str) -> bool:
+        return meeting_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,309 @@
+import asyncio
+import bisect
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> Iterator[str]:
+        """Exposition lines for every label set, without the HELP and TYPE header."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._sent: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def take_delta(self) -> Dict[LabelValues, float]:
+        delta = {key: value - self._sent.get(key, 0) for key, value in self._values.items()
+                 if value != self._sent.get(key, 0)}
+        self._sent.update((key, self._values[key]) for key in delta)
+        return delta
+
+    def merge(self, delta: Dict[LabelValues, float]):
+        for key, amount in delta.items():
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterator[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Gauge(Metric):
+    """Gauge that is either set directly or read from ``callback`` at scrape time.
+
+    A callback returns ``{label values: value}``, letting live objects such as caches
+    report their own counters without pushing every change here.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 callback: Optional[Callable[[], Dict[LabelValues, float]]] = None, kind: Optional[str] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+        if kind:
+            self.kind = kind
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> Iterator[str]:
+        values = self.callback() if self.callback else self._values
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: count in each bucket (not cumulative) plus one for +Inf, sum and count
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._sent: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def _get_series(self, key: LabelValues) -> Tuple[List[int], List[float]]:
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+        return series
+
+    def observe(self, value: float, **labels: str):
+        counts, totals = self._get_series(self._key(labels))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def take_delta(self) -> Dict[LabelValues, Tuple[List[int], List[float]]]:
+        delta = {}
+        for key, (counts, totals) in self._series.items():
+            sent_counts, sent_totals = self._sent.get(key, ([0] * len(counts), [0.0, 0]))
+            if totals[1] == sent_totals[1]:
+                continue
+            delta[key] = ([count - sent for count, sent in zip(counts, sent_counts)],
+                          [totals[0] - sent_totals[0], totals[1] - sent_totals[1]])
+            self._sent[key] = (list(counts), list(totals))
+        return delta
+
+    def merge(self, delta: Dict[LabelValues, Tuple[List[int], List[float]]]):
+        for key, (counts, totals) in delta.items():
+            own_counts, own_totals = self._get_series(key)
+            for i, count in enumerate(counts):
+                own_counts[i] += count
+            own_totals[0] += totals[0]
+            own_totals[1] += totals[1]
+
+    def samples(self) -> Iterator[str]:
+        for key, (counts, totals) in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(totals[0])}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {int(totals[1])}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = (), **kwargs) -> Gauge:
+        return self.register(Gauge(name, documentation, labels, **kwargs))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def take_deltas(self) -> Dict[str, Dict]:
+        """Counter and histogram increments since the last call, for a worker process to hand to its parent."""
+        deltas = {}
+        for name, metric in self.metrics.items():
+            if isinstance(metric, (Counter, Histogram)):
+                delta = metric.take_delta()
+                if delta:
+                    deltas[name] = delta
+        return deltas
+
+    def merge_deltas(self, deltas: Dict[str, Dict]):
+        """Add increments taken from another process's registry to this one."""
+        for name, delta in deltas.items():
+            metric = self.metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                metric.merge(delta)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+COMMAND_LATENCY = REGISTRY.histogram("bot_command_duration_seconds", "Time to run a bot command.",
+                                     ("command", "outcome"))
+COMMAND_ERRORS = REGISTRY.counter("bot_command_errors_total", "Errors reported to on_command_error.",
+                                  ("command", "error"))
+API_REQUESTS = REGISTRY.counter("bot_api_requests_total", "Outbound API calls by service, endpoint and outcome.",
+                                ("service", "endpoint", "status"))
+API_LATENCY = REGISTRY.histogram("bot_api_request_duration_seconds", "Outbound API call latency.",
+                                 ("service", "endpoint"))
+API_RATE_LIMITED = REGISTRY.counter("bot_api_rate_limited_total", "Outbound API calls answered with 429.",
+                                    ("service", "endpoint"))
+LOOP_LAG = REGISTRY.histogram("bot_event_loop_lag_seconds", "How late the event loop woke a sleeping task.",
+                              buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+MEETING_SYNC_DURATION = REGISTRY.histogram("bot_meeting_sync_duration_seconds",
+                                           "Time to sync changed Notion meetings to Discord events.")
+
+
+def observe_api_call(service: str, endpoint: str, status: str, elapsed: float):
+    """Record one outbound call; ``status`` is the HTTP status, or a short error name."""
+    API_REQUESTS.inc(service=service, endpoint=endpoint, status=status)
+    API_LATENCY.observe(elapsed, service=service, endpoint=endpoint)
+    if status == "429":
+        API_RATE_LIMITED.inc(service=service, endpoint=endpoint)
+
+
+_CACHES: Dict[str, object] = {}
+
+
+def register_cache(name: str, cache):
+    """Export a cache's ``hits``/``misses`` counters and hit ratio, read at scrape time."""
+    _CACHES[name] = cache
+
+
+def _cache_samples(field: str) -> Dict[LabelValues, float]:
+    samples = {}
+    for name, cache in _CACHES.items():
+        if field == "ratio":
+            total = cache.hits + cache.misses
+            samples[(name,)] = cache.hits / total if total else 0.0
+        else:
+            samples[(name,)] = getattr(cache, field)
+    return samples
+
+
+REGISTRY.gauge("bot_cache_hits_total", "Cache lookups answered from the cache.", ("cache",),
+               callback=lambda: _cache_samples("hits"), kind="counter")
+REGISTRY.gauge("bot_cache_misses_total", "Cache lookups that missed.", ("cache",),
+               callback=lambda: _cache_samples("misses"), kind="counter")
+REGISTRY.gauge("bot_cache_hit_ratio", "Share of cache lookups that hit since start.", ("cache",),
+               callback=lambda: _cache_samples("ratio"))
+
+
+_DASHBOARDS: Dict[str, object] = {}
+
+
+def register_dashboards(dashboards):
+    """Export how many sprint dashboards are stored and the task memory they hold, read at scrape time."""
+    _DASHBOARDS["sprint"] = dashboards
+
+
+def _dashboard_samples(field: str) -> Dict[LabelValues, float]:
+    dashboards = _DASHBOARDS.get("sprint")
+    if dashboards is None:
+        return {}
+    return {(): len(dashboards) if field == "count" else dashboards.memory_size()}
+
+
+REGISTRY.gauge("bot_sprint_dashboards", "Sprint dashboards whose task snapshots are stored.",
+               callback=lambda: _dashboard_samples("count"))
+REGISTRY.gauge("bot_sprint_dashboard_bytes", "Approximate bytes of task data held for stored sprint dashboards.",
+               callback=lambda: _dashboard_samples("bytes"))
+
+
+async def monitor_loop_lag(interval: float = 1.0):
+    """Sleep ``interval`` seconds at a time and record how much later than asked each wake-up came."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        LOOP_LAG.observe(max(loop.time() - start - interval, 0.0))
+
+
+class MetricsServer:
+    """Serves ``/metrics`` for Prometheus, on localhost unless told otherwise."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9100):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional["web.AppRunner"] = None
+
+    def is_running(self) -> bool:
+        return self._runner is not None
+
+    async def start(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle(self, request: "web.Request") -> "web.Response":
+        from aiohttp import web
+
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from util.metrics import observe_api_call
+
+if TYPE_CHECKING:
+    from notion_client import AsyncClient
+
+
+def notion_errors() -> Tuple[type, ...]:
+    """Exceptions a failed or timed out Notion call raises, for use in ``except`` clauses.
+
+    ``HTTPResponseError`` also covers the non-JSON 5xx pages Notion or Cloudflare send,
+    and ``httpx.HTTPError`` the transport failures underneath the client.
+    """
+    import httpx
+    from notion_client.errors import HTTPResponseError, RequestTimeoutError
+    return HTTPResponseError, RequestTimeoutError, httpx.HTTPError, asyncio.TimeoutError
+
+
+class NotionGateway:
+    """Async wrapper that every Notion call goes through.
+
+    Calls share one pooled AsyncClient, are capped at ``max_concurrency`` in flight
+    (Notion averages ~3 requests/s per integration) and are cancelled after ``timeout``
+    seconds so a slow workspace never stalls the Discord gateway. The client, and
+    notion_client itself, are only loaded on the first call so startup does not pay for them.
+    """
+
+    def __init__(self, auth: str, max_concurrency: int = 3, timeout: float = 10.0, page_size: int = 100,
+                 prefetch: bool = True, base_url: Optional[str] = None):
+        self.timeout = timeout
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self._auth = auth
+        self.base_url = base_url
+        self._client: Optional["AsyncClient"] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def client(self) -> "AsyncClient":
+        if self._client is None:
+            from notion_client import AsyncClient
+            options = {"base_url": self.base_url} if self.base_url else {}
+            self._client = AsyncClient(auth=self._auth, timeout_ms=int(self.timeout * 1000), **options)
+        return self._client
+
+    async def _call(self, endpoint, **kwargs) -> Any:
+        # e.g. DatabasesEndpoint.query -> databases.query
+        name = f"{type(endpoint.__self__).__name__.replace('Endpoint', '').lower()}.{endpoint.__name__}"
+        async with self._semaphore:
+            start = time.perf_counter()
+            status = "200"
+            try:
+                return await asyncio.wait_for(endpoint(**kwargs), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                status = "timeout"
+                raise
+            except Exception as e:
+                status = str(getattr(e, "status", None) or type(e).__name__)
+                raise
+            finally:
+                observe_api_call("notion", name, status, time.perf_counter() - start)
+
+    async def retrieve_database(self, database_id: str) -> Dict:
+        return await self._call(self.client.databases.retrieve, database_id=database_id)
+
+    async def query_database(self, database_id: str, **kwargs) -> Dict:
+        return await self._call(self.client.databases.query, database_id=database_id, **kwargs)
+
+    async def retrieve_page(self, page_id: str) -> Dict:
+        return await self._call(self.client.pages.retrieve, page_id=page_id)
+
+    async def iter_query(self, database_id: str, page_size: Optional[int] = None, prefetch: Optional[bool] = None,
+                         **kwargs) -> AsyncIterator[List[Dict]]:
+        """Stream a database query one page of results at a time.
+
+        Follows ``next_cursor`` until ``has_more`` is false. With prefetch, the next page is
+        already in flight while the caller works through the current one.
+        """
+        page_size = page_size or self.page_size
+        prefetch = self.prefetch if prefetch is None else prefetch
+
+        def request_page(cursor: Optional[str]) -> asyncio.Future:
+            params = dict(kwargs, page_size=page_size)
+            if cursor:
+                params["start_cursor"] = cursor
+            return asyncio.ensure_future(self.query_database(database_id, **params))
+
+        pending = request_page(None)
+        try:
+            while pending is not None:
+                response = await pending
+                pending = None
+                cursor = response.get("next_cursor") if response.get("has_more") else None
+                if cursor and prefetch:
+                    pending = request_page(cursor)
+                yield response.get("results", [])
+                if cursor and pending is None:
+                    pending = request_page(cursor)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def create_database(self, **kwargs) -> Dict:
+        return await self._call(self.client.databases.create, **kwargs)
+
+    async def retrieve_block(self, block_id: str) -> Dict:
+        return await self._call(self.client.blocks.retrieve, block_id=block_id)
+
+    async def append_block_children(self, block_id: str, children: List[Dict]) -> Dict:
+        return await self._call(self.client.blocks.children.append, block_id=block_id, children=children)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,100 @@
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+
+class FieldSpec(NamedTuple):
+    """One value to pull out of a page: which property, the type to assume when the schema
+    doesn't say, and what to use when a page lacks the property or it is empty."""
+    property_name: str
+    property_type: str
+    default: Any = None
+
+
+def _text_getter(property_type: str, default: Any) -> Callable[[Dict], Any]:
+    def get(prop: Dict) -> Any:
+        parts = prop.get(property_type) or []
+        return " ".join(part["text"]["content"] for part in parts if "text" in part) if parts else default
+    return get
+
+
+def _option_getter(property_type: str, default: Any) -> Callable[[Dict], Any]:
+    def get(prop: Dict) -> Any:
+        option = prop.get(property_type)
+        return option.get("name", default) if option else default
+    return get
+
+
+def _people_getter(property_type: str, default: Any) -> Callable[[Dict], Any]:
+    def get(prop: Dict) -> Any:
+        people = prop.get(property_type)
+        return [person.get("name", "Unknown") for person in people] if people else default
+    return get
+
+
+def _multi_select_getter(property_type: str, default: Any) -> Callable[[Dict], Any]:
+    def get(prop: Dict) -> Any:
+        options = prop.get(property_type)
+        return [option["name"] for option in options] if options else default
+    return get
+
+
+def _value_getter(property_type: str, default: Any) -> Callable[[Dict], Any]:
+    def get(prop: Dict) -> Any:
+        value = prop.get(property_type)
+        return default if value is None else value
+    return get
+
+
+GETTERS: Dict[str, Callable[[str, Any], Callable[[Dict], Any]]] = {
+    "title": _text_getter,
+    "rich_text": _text_getter,
+    "select": _option_getter,
+    "status": _option_getter,
+    "people": _people_getter,
+    "multi_select": _multi_select_getter,
+}
+
+
+class PropertyExtractor:
+    """Reads a fixed set of fields from batches of Notion pages, compiled once per database schema.
+
+    ``schema`` is the ``properties`` object from ``databases.retrieve``. It decides each
+    property's real type, so a Status column can be a select or a status property. Without
+    a schema the types in the field specs are assumed. Fields whose property the database
+    does not have always read as their default. ``extract`` returns one list per field,
+    plus page ``id`` and ``last_edited_time``, filled in a single pass over the pages.
+    """
+
+    def __init__(self, fields: Mapping[str, FieldSpec], schema: Optional[Mapping[str, Dict]] = None):
+        self.fields = dict(fields)
+        self.record_type = namedtuple("Record", ("id", "last_edited_time", *self.fields))
+        self._plan: List[Tuple[str, str, Optional[Callable[[Dict], Any]], Any]] = []
+        for field, spec in self.fields.items():
+            property_type = spec.property_type
+            getter: Optional[Callable[[Dict], Any]]
+            if schema is not None and spec.property_name not in schema:
+                print(f"Notion database has no '{spec.property_name}' property, using {spec.default!r}")
+                getter = None
+            else:
+                if schema is not None:
+                    property_type = schema[spec.property_name].get("type", property_type)
+                getter = GETTERS.get(property_type, _value_getter)(property_type, spec.default)
+            self._plan.append((field, spec.property_name, getter, spec.default))
+
+    def extract(self, pages: Iterable[Dict]) -> Dict[str, List]:
+        columns: Dict[str, List] = {"id": [], "last_edited_time": [], **{field: [] for field in self.fields}}
+        ids, edited = columns["id"], columns["last_edited_time"]
+        plan = [(columns[field], name, getter, default) for field, name, getter, default in self._plan]
+        for page in pages:
+            ids.append(page["id"])
+            edited.append(page.get("last_edited_time"))
+            properties = page.get("properties", {})
+            for column, name, getter, default in plan:
+                prop = properties.get(name) if getter is not None else None
+                column.append(default if prop is None else getter(prop))
+        return columns
+
+    def records(self, pages: Iterable[Dict]) -> List[NamedTuple]:
+        """The same values as ``extract``, one named tuple per page."""
+        columns = self.extract(pages)
+        return list(map(self.record_type._make, zip(*columns.values())))
@@ -0,0 +1,54 @@
+from typing import Dict, FrozenSet, Iterable, Mapping, Union
+
+# Roles allowed to run commands that have no entry of their own in the ACL
+DEFAULT_ACL_KEY = "*"
+
+RoleRef = Union[int, str]
+
+
+def resolve_role_ids(refs: Iterable[RoleRef], roles_by_name: Mapping[str, int]) -> FrozenSet[int]:
+    """Turn ACL entries into role IDs; entries are role IDs or, for convenience, role names."""
+    ids = set()
+    for ref in refs:
+        if isinstance(ref, int) or str(ref).isdigit():
+            ids.add(int(ref))
+        elif ref in roles_by_name:
+            ids.add(roles_by_name[ref])
+        else:
+            print(f"Unknown role '{ref}' in command ACL, ignoring it")
+    return frozenset(ids)
+
+
+class PermissionMatrix:
+    """Which commands each combination of roles may run, worked out once per combination.
+
+    ``acl`` maps a command name to the role IDs allowed to run it, with ``"*"`` covering
+    commands without an entry of their own; ``public`` commands are open to everyone.
+    A member's role IDs are first narrowed to the roles the ACL mentions, so the whole team
+    typically shares a handful of rows. Equal results are the same frozenset object, which
+    lets callers key further caches, such as help embeds, on the permission set itself.
+    """
+
+    def __init__(self, command_names: Iterable[str], acl: Mapping[str, FrozenSet[int]],
+                 public: Iterable[str] = ()):
+        self.command_names = frozenset(command_names)
+        self.public = frozenset(public)
+        default = acl.get(DEFAULT_ACL_KEY, frozenset())
+        self.acl: Dict[str, FrozenSet[int]] = {name: acl.get(name, default) for name in self.command_names}
+        self.relevant_roles = frozenset().union(*self.acl.values())
+        self._rows: Dict[FrozenSet[int], FrozenSet[str]] = {}
+        self._sets: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+    def allowed(self, role_ids: Iterable[int]) -> FrozenSet[str]:
+        """Names of the commands a member with ``role_ids`` may run."""
+        key = self.relevant_roles.intersection(role_ids)
+        row = self._rows.get(key)
+        if row is None:
+            row = frozenset(name for name, roles in self.acl.items()
+                            if name in self.public or not roles.isdisjoint(key))
+            row = self._rows[key] = self._sets.setdefault(row, row)
+        return row
+
+    def everything(self) -> FrozenSet[str]:
+        """Permission set for members who may run every command, like the guild owner."""
+        return self._sets.setdefault(self.command_names, self.command_names)
@@ -0,0 +1,150 @@
+import asyncio
+import math
+import time
+from typing import Any, Dict, Tuple
+
+import aiohttp
+
+from util.metrics import observe_api_call
+from util.util import get_discord_route_key
+
+
+class RateLimitBucket:
+    """Local view of one Discord rate-limit bucket.
+
+    Until the first response reports a limit, only one request is let through so the
+    bucket's size can be learned. Waiters queue on the lock and are released in order
+    as soon as the bucket has capacity again.
+    """
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.limit = 1
+        self.remaining = 1
+        self.reset_at = math.inf
+        self.in_flight = 0
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        async with self.lock:
+            while True:
+                now = loop.time()
+                if self.reset_at <= now:
+                    self.remaining = self.limit - self.in_flight
+                    self.reset_at = math.inf
+                if self.remaining > 0:
+                    self.remaining -= 1
+                    self.in_flight += 1
+                    return
+                # Unknown reset means a discovery request is still in flight, poll for its headers
+                await asyncio.sleep(0.05 if self.reset_at == math.inf else self.reset_at - now)
+
+    def release(self, headers=None):
+        self.in_flight -= 1
+        if headers is None:
+            # The request never got a response, hand its slot back
+            self.remaining = min(self.remaining + 1, self.limit)
+            return
+
+        loop = asyncio.get_running_loop()
+        if "X-RateLimit-Limit" not in headers:
+            if "Retry-After" in headers:
+                # Global and Cloudflare 429s carry no bucket headers, reopen once they expire
+                self.exhaust(float(headers["Retry-After"]))
+            else:
+                # Route reported no limit, stop holding requests back
+                self.limit = self.remaining = math.inf
+            return
+        self.limit = int(headers["X-RateLimit-Limit"])
+        self.remaining = max(int(headers["X-RateLimit-Remaining"]) - self.in_flight, 0)
+        self.reset_at = loop.time() + float(headers["X-RateLimit-Reset-After"])
+
+    def exhaust(self, retry_after: float):
+        self.remaining = 0
+        self.reset_at = asyncio.get_running_loop().time() + retry_after
+
+
+class DiscordRateLimiter:
+    """Schedules raw Discord REST calls around per-bucket and global rate limits.
+
+    Requests are keyed by route (see ``get_discord_route_key``) until Discord tells us
+    which bucket the route belongs to; routes sharing an ``X-RateLimit-Bucket`` then share
+    one ``RateLimitBucket``. 429s sleep for ``Retry-After`` and are retried up to
+    ``max_retries`` times, pausing every request when the limit is global.
+    """
+
+    def __init__(self, max_retries: int = 3):
+        self.max_retries = max_retries
+        self._route_buckets: Dict[str, str] = {}
+        self._buckets: Dict[str, RateLimitBucket] = {}
+        self._global_clear = asyncio.Event()
+        self._global_clear.set()
+
+    def _get_bucket(self, route: str) -> RateLimitBucket:
+        key = self._route_buckets.get(route, route)
+        if key not in self._buckets:
+            self._buckets[key] = RateLimitBucket()
+        return self._buckets[key]
+
+    def _learn_bucket(self, route: str, bucket: RateLimitBucket, bucket_hash: str):
+        # Major parameters stay part of the key, as they split buckets on Discord's side too
+        major = route.split(" ", 1)[1].split("/")[1:3]
+        key = f"{bucket_hash}:{'/'.join(major)}"
+        if self._route_buckets.get(route) == key:
+            return
+        self._route_buckets[route] = key
+        self._buckets.setdefault(key, bucket)
+
+    async def _pause_globally(self, retry_after: float):
+        if not self._global_clear.is_set():
+            return
+        self._global_clear.clear()
+        try:
+            await asyncio.sleep(retry_after)
+        finally:
+            self._global_clear.set()
+
+    async def request(self, session: aiohttp.ClientSession, method: str, url: str, **kwargs) -> Tuple[int, Any]:
+        """Send a request once its bucket has capacity, returning the status and decoded body."""
+        route = get_discord_route_key(method, url)
+
+        for attempt in range(self.max_retries + 1):
+            await self._global_clear.wait()
+            bucket = self._get_bucket(route)
+            await bucket.acquire()
+            headers = None
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                async with session.request(method, url, **kwargs) as response:
+                    headers = response.headers
+                    outcome = str(response.status)
+                    if response.content_type == "application/json":
+                        body = await response.json()
+                    else:
+                        body = await response.text()
+                    status = response.status
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                raise
+            finally:
+                bucket.release(headers)
+                observe_api_call("discord", route, outcome, time.perf_counter() - start)
+
+            if "X-RateLimit-Bucket" in headers:
+                self._learn_bucket(route, bucket, headers["X-RateLimit-Bucket"])
+
+            if status != 429 or attempt == self.max_retries:
+                return status, body
+
+            if not isinstance(body, dict):
+                body = {}
+            retry_after = float(headers.get("Retry-After") or body.get("retry_after", 1))
+            if headers.get("X-RateLimit-Global") or body.get("global"):
+                print(f"Hit Discord global rate limit, pausing all requests for {retry_after}s")
+                await self._pause_globally(retry_after)
+            else:
+                print(f"Rate limited on {route}, retrying in {retry_after}s")
+                bucket.exhaust(retry_after)
+
+        return status, body
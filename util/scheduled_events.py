@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from typing import Dict
+
+
+def build_event_data(title: str, start_time: str, event_end: str, meeting_type: int, location: str = "") -> Dict:
+    """Build the Discord scheduled-event payload for a Notion meeting."""
+    # Convert Notion date to ISO format for Discord
+    event_start = datetime.fromisoformat(start_time).astimezone(timezone.utc).isoformat()
+
+    event_data = {
+        "name": title,
+        "scheduled_start_time": event_start,
+        "scheduled_end_time": event_end,
+        "privacy_level": 2,
+        "entity_type": meeting_type
+    }
+
+    if meeting_type == 2:
+        event_data["channel_id"] = location
+    else:
+        event_data["entity_metadata"] = {
+            "location": location
+        }
+    return event_data
+
+
+def _parse_event_time(value: str):
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # Discord reads offset-less times as UTC
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def event_needs_update(event: Dict, event_data: Dict) -> bool:
+    """Whether an existing Discord event differs from the payload we would send for it."""
+    if event.get("name") != event_data["name"] or event.get("entity_type") != event_data["entity_type"]:
+        return True
+    for key in ("scheduled_start_time", "scheduled_end_time"):
+        if _parse_event_time(event.get(key)) != _parse_event_time(event_data[key]):
+            return True
+    if event_data["entity_type"] == 2:
+        return str(event.get("channel_id")) != str(event_data["channel_id"])
+    return (event.get("entity_metadata") or {}).get("location") != event_data["entity_metadata"]["location"]
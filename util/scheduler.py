@@ -0,0 +1,206 @@
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, tzinfo
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+# Longest single sleep, so wall-clock jumps (NTP, suspend) are noticed before a job is due
+MAX_SLEEP = 300
+
+
+def _parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+        else:
+            start = end = int(part)
+            if step != 1:
+                end = high
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field '{field}'")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSpec:
+    """Five-field cron expression (minute hour day-of-month month day-of-week) in a timezone.
+
+    Supports ``*``, lists, ranges and steps. Day-of-week runs 0-6 from Sunday, and 7 is also
+    Sunday. As in cron, when both day fields are restricted a day matching either one fires.
+    """
+
+    def __init__(self, expression: str, tz: Optional[tzinfo] = None):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' needs 5 fields")
+        self.expression = expression
+        self.tz = tz
+        self.minutes = sorted(_parse_cron_field(fields[0], 0, 59))
+        self.hours = sorted(_parse_cron_field(fields[1], 0, 23))
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        self.weekdays = {day % 7 for day in _parse_cron_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        # Python counts Monday as 0, cron counts Sunday as 0
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def _local(self, moment: datetime) -> datetime:
+        return moment.astimezone(self.tz) if self.tz else moment.astimezone()
+
+    def _candidates(self, day: datetime, reverse: bool):
+        for hour in (reversed(self.hours) if reverse else self.hours):
+            for minute in (reversed(self.minutes) if reverse else self.minutes):
+                local = day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                yield local.replace(tzinfo=self.tz) if self.tz else local.astimezone()
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First fire time strictly after ``moment``."""
+        day = self._local(moment).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(366 * 5):
+            if self._day_matches(day):
+                for candidate in self._candidates(day, reverse=False):
+                    if candidate > moment:
+                        return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+    def previous_before(self, moment: datetime) -> datetime:
+        """Last fire time at or before ``moment``."""
+        day = self._local(moment).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+        for _ in range(366 * 5):
+            if self._day_matches(day):
+                for candidate in self._candidates(day, reverse=True):
+                    if candidate <= moment:
+                        return candidate
+            day -= timedelta(days=1)
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+
+class Job(ABC):
+    def __init__(self, name: str, func: Callable[[], Awaitable]):
+        self.name = name
+        self.func = func
+        self.last_run: Optional[datetime] = None
+        self.next_run: Optional[datetime] = None
+
+    @abstractmethod
+    def first_run(self, now: datetime) -> datetime:
+        """When the job runs first, given the time the scheduler started it."""
+
+    @abstractmethod
+    def after_run(self, started: datetime, result) -> datetime:
+        """When the job runs next, given when the last run started and what it returned."""
+
+
+class CronJob(Job):
+    """Fires on a cron schedule. On start, runs once straight away if the latest scheduled
+    time since ``last_run`` was missed and is no older than ``catch_up``."""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable], spec: CronSpec,
+                 last_run: Optional[datetime] = None, catch_up: Optional[timedelta] = None):
+        super().__init__(name, func)
+        self.spec = spec
+        self.last_run = last_run
+        self.catch_up = catch_up
+
+    def first_run(self, now: datetime) -> datetime:
+        missed = self.spec.previous_before(now)
+        if (self.last_run is None or self.last_run < missed) and \
+                (self.catch_up is None or now - missed <= self.catch_up):
+            print(f"Catching up on missed {self.name} run scheduled for {missed.isoformat()}")
+            return now
+        return self.spec.next_after(now)
+
+    def after_run(self, started: datetime, result) -> datetime:
+        return self.spec.next_after(max(started, datetime.now(started.tzinfo)))
+
+
+class AdaptiveJob(Job):
+    """Runs back to back with the delay between runs chosen by the job: ``func`` returns how
+    many seconds to wait before the next run."""
+
+    def __init__(self, name: str, func: Callable[[], Awaitable[float]], first_delay: float = 0):
+        super().__init__(name, func)
+        self.first_delay = first_delay
+
+    def first_run(self, now: datetime) -> datetime:
+        return now + timedelta(seconds=self.first_delay)
+
+    def after_run(self, started: datetime, result) -> datetime:
+        return datetime.now(started.tzinfo) + timedelta(seconds=result)
+
+
+class Scheduler:
+    """Runs registered jobs at their exact next fire time, one asyncio task per job.
+
+    A job never overlaps itself: the next fire time is only computed once the current run
+    has finished. Jobs that need catch-up after a restart persist their own last run and
+    pass it back in through ``add_cron``.
+    """
+
+    def __init__(self, tz: Optional[tzinfo] = None):
+        self.tz = tz
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_cron(self, name: str, expression: str, func: Callable[[], Awaitable],
+                 last_run: Optional[datetime] = None, catch_up: Optional[timedelta] = None) -> CronJob:
+        job = CronJob(name, func, CronSpec(expression, self.tz), last_run, catch_up)
+        self.jobs[name] = job
+        return job
+
+    def add_adaptive(self, name: str, func: Callable[[], Awaitable[float]], first_delay: float = 0) -> AdaptiveJob:
+        job = AdaptiveJob(name, func, first_delay)
+        self.jobs[name] = job
+        return job
+
+    def is_running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self):
+        self._tasks = [asyncio.ensure_future(self._run_job(job)) for job in self.jobs.values()]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def _now(self) -> datetime:
+        return datetime.now(self.tz) if self.tz else datetime.now().astimezone()
+
+    async def _sleep_until(self, moment: datetime):
+        while True:
+            remaining = (moment - self._now()).total_seconds()
+            if remaining <= 0:
+                return
+            await asyncio.sleep(min(remaining, MAX_SLEEP))
+
+    async def _run_job(self, job: Job):
+        job.next_run = job.first_run(self._now())
+        while True:
+            await self._sleep_until(job.next_run)
+            started = self._now()
+            try:
+                result = await job.func()
+            except Exception as e:
+                print(f"Error in scheduled job {job.name}: {e!r}")
+                # Adaptive jobs need a delay back, fall back to retrying after a minute
+                result = 60
+            else:
+                job.last_run = started
+            job.next_run = job.after_run(started, result)
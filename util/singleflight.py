@@ -0,0 +1,38 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight call.
+
+    The first caller for a key starts the work; everyone arriving while it runs awaits the
+    same future and gets the same result or exception. Once it finishes the key is free
+    again, so later calls start fresh work. A caller being cancelled never cancels the
+    shared work for the others. ``hits`` counts calls that joined an existing flight and
+    ``misses`` those that started one, matching the cache counters so both export alike.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        future = self._calls.get(key)
+        if future is None:
+            self.misses += 1
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.hits += 1
+        return await asyncio.shield(future)
+
+    def _finished(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Mark the exception as retrieved, every waiter may have been cancelled already
+        if not future.cancelled():
+            future.exception()
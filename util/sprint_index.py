@@ -0,0 +1,216 @@
+import sys
+import zlib
+from datetime import datetime, timezone, timedelta
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from util.notion_schema import FieldSpec, PropertyExtractor
+
+
+# Task fields the dashboard reads, and the Notion properties they come from
+TASK_FIELDS = {
+    "name": FieldSpec("Name", "title", "Untitled"),
+    "status": FieldSpec("Status", "select", "Unknown"),
+    "owners": FieldSpec("Assigned To", "people", ["Unassigned"]),
+}
+
+# Dashboard buckets in display order. A bucket takes the tasks whose status is in
+# "statuses" (compared case-insensitively), "*" takes every status no other bucket claims.
+DEFAULT_STATUS_BUCKETS = [
+    {"key": "completed", "label": "Completed Tasks", "emoji": "✅", "style": "success", "color": "green",
+     "statuses": ["Complete"], "empty": "No completed tasks in this sprint."},
+    {"key": "in_progress", "label": "In Progress Tasks", "emoji": "🔄", "style": "primary", "color": "blue",
+     "statuses": ["In progress"], "empty": "No tasks in progress in this sprint."},
+    {"key": "blocked", "label": "Blocked Tasks", "emoji": "🚫", "style": "danger", "color": "red",
+     "statuses": ["Blocked"], "empty": "No blocked tasks in this sprint."},
+    {"key": "other", "label": "Other Tasks", "emoji": "📋", "style": "secondary", "color": "light_grey",
+     "statuses": ["*"], "empty": "No tasks with other statuses in this sprint."},
+]
+
+
+class StatusBucket:
+    __slots__ = ("key", "label", "emoji", "style", "color", "statuses", "empty")
+
+    def __init__(self, key: str, label: str, emoji: str = "", style: str = "secondary", color: str = "blurple",
+                 statuses: Iterable[str] = (), empty: Optional[str] = None):
+        self.key = key
+        self.label = label
+        self.emoji = emoji
+        self.style = style
+        self.color = color
+        self.statuses = tuple(statuses)
+        self.empty = empty or f"No {label.lower()} in this sprint."
+
+
+class StatusBuckets:
+    """Maps task statuses to dashboard buckets with one dict lookup per task."""
+
+    def __init__(self, config: Iterable[Dict] = DEFAULT_STATUS_BUCKETS):
+        self.buckets: Dict[str, StatusBucket] = {}
+        self._by_status: Dict[str, str] = {}
+        self._fallback: Optional[str] = None
+        for entry in config:
+            bucket = StatusBucket(**entry)
+            self.buckets[bucket.key] = bucket
+            for status in bucket.statuses:
+                if status == "*":
+                    self._fallback = bucket.key
+                else:
+                    self._by_status.setdefault(status.lower(), bucket.key)
+        # Part of every snapshot version, so changing the buckets regroups existing snapshots
+        self.signature = format(zlib.crc32(repr(sorted(
+            (key, bucket.statuses) for key, bucket in self.buckets.items())).encode()), "08x")
+
+    def bucket_for(self, status: str) -> Optional[str]:
+        return self._by_status.get(status.lower(), self._fallback)
+
+    def get(self, key: str) -> StatusBucket:
+        """The bucket for ``key``, or a plain stand-in for keys no longer configured."""
+        bucket = self.buckets.get(key)
+        return bucket or StatusBucket(key, f"{key.replace('_', ' ').title()} Tasks")
+
+    def __iter__(self) -> Iterator[StatusBucket]:
+        return iter(self.buckets.values())
+
+
+DEFAULT_TASK_EXTRACTOR = PropertyExtractor(TASK_FIELDS)
+
+
+class TaskRecord:
+    """One task line on the dashboard, slotted since a busy sprint holds hundreds of them."""
+    __slots__ = ("name", "url")
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+
+
+class SprintSnapshot:
+    """Immutable dashboard state of one sprint at one index version.
+
+    Every dashboard showing the same ``(sprint_id, version)`` shares a single instance, and
+    with it the pages rendered from it (``pages`` is only ever filled, never changed).
+    """
+    __slots__ = ("sprint_id", "version", "categories", "pages")
+
+    def __init__(self, sprint_id: str, version: str, categories: Dict[str, Tuple[TaskRecord, ...]]):
+        self.sprint_id = sprint_id
+        self.version = version
+        self.categories: Mapping[str, Tuple[TaskRecord, ...]] = MappingProxyType(dict(categories))
+        self.pages: Dict[str, tuple] = {}
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.sprint_id, self.version
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "SprintSnapshot":
+        return cls(data["sprint_id"], data["version"],
+                   {category: tuple(TaskRecord(name, url) for name, url in tasks)
+                    for category, tasks in data["tasks"].items()})
+
+    def to_json(self) -> Dict:
+        return {"sprint_id": self.sprint_id, "version": self.version,
+                "tasks": {category: [[task.name, task.url] for task in tasks]
+                          for category, tasks in self.categories.items()}}
+
+    def memory_size(self) -> int:
+        """Approximate bytes held by the task data, not counting rendered pages."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.categories)
+        for tasks in self.categories.values():
+            size += sys.getsizeof(tasks)
+            for task in tasks:
+                size += sys.getsizeof(task) + sys.getsizeof(task.name) + sys.getsizeof(task.url)
+        return size
+
+
+class SprintTaskIndex:
+    """Local copy of one sprint database's tasks, keyed by task ID.
+
+    ``watermark`` is the newest ``last_edited_time`` seen, so each refresh only has to ask
+    Notion for pages edited since then. Notion rounds ``last_edited_time`` to the minute,
+    so refreshes query ``on_or_after`` the watermark and re-applying a page is harmless.
+    Pages deleted or archived in Notion never show up in an incremental query, which is
+    why the index is rebuilt from scratch once it is older than the caller's max age.
+    ``revision`` counts the applies that changed a record, as edits within the
+    watermark's minute change tasks without moving the watermark.
+    """
+
+    def __init__(self, sprint_id: str, watermark: Optional[str] = None, built_at: Optional[str] = None,
+                 tasks: Optional[Dict[str, Dict]] = None, revision: int = 0):
+        self.sprint_id = sprint_id
+        self.watermark = watermark
+        self.built_at = built_at or datetime.now(timezone.utc).isoformat()
+        self.tasks: Dict[str, Dict] = tasks or {}
+        self.revision = revision
+        self._snapshot: Optional[SprintSnapshot] = None
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "SprintTaskIndex":
+        return cls(data["sprint_id"], data.get("watermark"), data.get("built_at"), data.get("tasks", {}),
+                   data.get("revision", 0))
+
+    def to_json(self) -> Dict:
+        return {"sprint_id": self.sprint_id, "watermark": self.watermark, "built_at": self.built_at,
+                "tasks": self.tasks, "revision": self.revision}
+
+    @property
+    def version(self) -> str:
+        """Changes whenever the indexed tasks changed: a changed record or a rebuild."""
+        return f"{self.watermark}@{self.built_at}+{self.revision}"
+
+    def is_stale(self, max_age: timedelta) -> bool:
+        return datetime.fromisoformat(self.built_at) + max_age < datetime.now(timezone.utc)
+
+    def query_filter(self) -> Optional[Dict]:
+        if not self.watermark:
+            return None
+        return {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": self.watermark}}
+
+    def apply(self, pages: List[Dict], extractor: Optional[PropertyExtractor] = None) -> Tuple[int, Optional[str]]:
+        """Upsert edited task pages, returning how many records actually changed and the newest edit time.
+
+        The watermark is left alone: queries aren't sorted by edit time, so the caller moves
+        it with ``advance`` only once every page of the query has been applied.
+        ``extractor`` should be compiled from the sprint database's schema; without one the
+        property types in ``TASK_FIELDS`` are assumed.
+        """
+        columns = (extractor or DEFAULT_TASK_EXTRACTOR).extract(pages)
+        changed = 0
+        newest = None
+        for task_id, edited, name, status, owners in zip(columns["id"], columns["last_edited_time"],
+                                                          columns["name"], columns["status"], columns["owners"]):
+            record = {"name": name, "status": status, "owners": owners}
+            if self.tasks.get(task_id) != record:
+                self.tasks[task_id] = record
+                changed += 1
+            if edited and (not newest or edited > newest):
+                newest = edited
+        if changed:
+            self.revision += 1
+        return changed, newest
+
+    def advance(self, edited: Optional[str]):
+        """Move the watermark up to ``edited``, never back."""
+        if edited and (not self.watermark or edited > self.watermark):
+            self.watermark = edited
+
+    def snapshot(self, buckets: StatusBuckets) -> SprintSnapshot:
+        """Dashboard snapshot of the current tasks, rebuilt only when the version or buckets changed."""
+        version = f"{self.version}#{buckets.signature}"
+        if self._snapshot and self._snapshot.version == version:
+            return self._snapshot
+
+        # Organize tasks by status bucket with proper format for buttons
+        grouped: Dict[str, List[TaskRecord]] = {bucket.key: [] for bucket in buckets}
+        for task_id, record in self.tasks.items():
+            key = buckets.bucket_for(record["status"])
+            if key is None:
+                continue
+            # Create task data for buttons
+            grouped[key].append(TaskRecord(f"{record['name']} | {', '.join(record['owners'])}",
+                                           f"https://www.notion.so/{task_id.replace('-', '')}"))
+
+        self._snapshot = SprintSnapshot(self.sprint_id, version,
+                                        {key: tuple(tasks) for key, tasks in grouped.items()})
+        return self._snapshot
@@ -0,0 +1,36 @@
+import time
+from typing import List, Optional, Tuple
+
+
+class StartupTrace:
+    """Named milestones from process start to the bot being ready, for measuring time-to-online.
+
+    ``started`` is a ``time.monotonic()`` reading taken as early as possible, normally the
+    first line of ``main.py``. Each milestone is only recorded the first time it is marked,
+    so reconnects don't overwrite the startup numbers.
+    """
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.monotonic()
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> float:
+        """Record a milestone and return the seconds since start."""
+        for mark_name, elapsed in self.marks:
+            if mark_name == name:
+                return elapsed
+        elapsed = time.monotonic() - self.started
+        self.marks.append((name, elapsed))
+        return elapsed
+
+    def elapsed(self, name: str) -> Optional[float]:
+        return next((elapsed for mark_name, elapsed in self.marks if mark_name == name), None)
+
+    def report(self) -> str:
+        """One line with each milestone's time since start and the step from the one before."""
+        parts = []
+        previous = 0.0
+        for name, elapsed in self.marks:
+            parts.append(f"{name} {elapsed:.3f}s (+{elapsed - previous:.3f}s)")
+            previous = elapsed
+        return "Startup: " + ", ".join(parts)
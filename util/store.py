@@ -0,0 +1,220 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from typing import Dict, Optional, Tuple
+
+from util.util import get_env_float
+
+
+class ConfigStore(ABC):
+    """Write-behind persistence for the bot config.
+
+    ``save`` only marks the config dirty; a burst of saves is coalesced into one write
+    ``delay`` seconds later, run in an executor so disk I/O stays off the event loop.
+    Outside a running loop, and in ``flush``/``aflush``, writes happen immediately.
+    """
+
+    def __init__(self, delay: float = 1.0):
+        self.delay = delay
+        self._config: Optional[Dict] = None
+        self._dirty = False
+        self._task: Optional[asyncio.Task] = None
+        self._write_lock = threading.Lock()
+        self._seq = 0
+        self._written_seq = 0
+
+    @abstractmethod
+    def load(self) -> Optional[Dict]:
+        """Return the stored config, or None when nothing has been stored yet."""
+
+    @abstractmethod
+    def _snapshot(self, config: Dict):
+        """Copy the config into something that can be written from another thread."""
+
+    @abstractmethod
+    def _write(self, snapshot):
+        """Persist a snapshot taken by ``_snapshot``, called from an executor thread."""
+
+    def _write_in_order(self, seq: int, snapshot):
+        with self._write_lock:
+            # A newer snapshot already landed, writing this one would roll the file back
+            if seq <= self._written_seq:
+                return
+            self._write(snapshot)
+            self._written_seq = seq
+
+    def _take_snapshot(self):
+        self._dirty = False
+        self._seq += 1
+        return self._seq, self._snapshot(self._config)
+
+    def save(self, config: Dict):
+        self._config = config
+        self._dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        loop = asyncio.get_running_loop()
+        while self._dirty:
+            await asyncio.sleep(self.delay)
+            seq, snapshot = self._take_snapshot()
+            try:
+                await loop.run_in_executor(None, self._write_in_order, seq, snapshot)
+            except Exception as e:
+                print(f"Error writing config: {e!r}")
+
+    def flush(self):
+        """Write any pending changes now, blocking the caller."""
+        if self._dirty:
+            self._write_in_order(*self._take_snapshot())
+
+    async def aflush(self):
+        """Write any pending changes now without waiting for the debounce delay."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+        if self._dirty:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_in_order, *self._take_snapshot())
+
+
+class JsonConfigStore(ConfigStore):
+    """Config kept in a single JSON file, replaced atomically on every write."""
+
+    def __init__(self, path: str, delay: float = 1.0):
+        super().__init__(delay)
+        self.path = path
+
+    def load(self) -> Optional[Dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r") as file:
+            return json.load(file)
+
+    def _snapshot(self, config: Dict) -> str:
+        return json.dumps(config, indent=4)
+
+    def _write(self, snapshot: str):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(self.path)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(snapshot)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+
+class SqliteConfigStore(ConfigStore):
+    """Config kept in SQLite, with one row per meeting_dict entry.
+
+    Top-level keys are stored as JSON values in ``config``; meetings of every guild
+    namespace live in their own table, keyed by guild and meeting, and only rows that
+    changed since the last write are touched. Guild ``""`` holds a top-level meeting_dict.
+    On first use the store is seeded from ``import_path`` if that JSON config exists.
+    """
+
+    def __init__(self, path: str, import_path: Optional[str] = None, delay: float = 1.0):
+        super().__init__(delay)
+        self.path = path
+        self.import_path = import_path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meetings (meeting_id TEXT PRIMARY KEY, "
+                               "discord_event_id TEXT NOT NULL, discord_event_time TEXT NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS guild_meetings (guild_id TEXT NOT NULL, "
+                               "meeting_id TEXT NOT NULL, discord_event_id TEXT NOT NULL, "
+                               "discord_event_time TEXT NOT NULL, PRIMARY KEY (guild_id, meeting_id))")
+            # Rows from before guild namespaces load as the top-level meeting_dict
+            self._conn.execute("INSERT OR IGNORE INTO guild_meetings SELECT '', * FROM meetings")
+            self._conn.execute("DELETE FROM meetings")
+        self._written_values: Dict[str, str] = {}
+        self._written_meetings: Dict[Tuple[str, str], tuple] = {}
+
+    def load(self) -> Optional[Dict]:
+        rows = self._conn.execute("SELECT key, value FROM config").fetchall()
+        if not rows:
+            if self.import_path and os.path.exists(self.import_path):
+                with open(self.import_path, "r") as file:
+                    return json.load(file)
+            return None
+
+        self._written_values = dict(rows)
+        config = {key: json.loads(value) for key, value in rows}
+        for guild_id, meeting_id, event_id, event_time in self._conn.execute("SELECT * FROM guild_meetings"):
+            namespace = config.setdefault("guilds", {}).setdefault(guild_id, {}) if guild_id else config
+            namespace.setdefault("meeting_dict", {})[meeting_id] = {"discord_event_id": event_id,
+                                                                    "discord_event_time": event_time}
+            self._written_meetings[guild_id, meeting_id] = (event_id, event_time)
+        return config
+
+    def _snapshot(self, config: Dict):
+        namespaces = {"": config, **config.get("guilds", {})}
+        meetings = {(guild_id, meeting_id): (info["discord_event_id"], info["discord_event_time"])
+                    for guild_id, namespace in namespaces.items()
+                    for meeting_id, info in namespace.get("meeting_dict", {}).items()}
+        values = {key: json.dumps(value) for key, value in config.items() if key not in ("meeting_dict", "guilds")}
+        if "guilds" in config:
+            values["guilds"] = json.dumps({guild_id: {key: value for key, value in namespace.items()
+                                                      if key != "meeting_dict"}
+                                           for guild_id, namespace in config["guilds"].items()})
+        return values, meetings
+
+    def _write(self, snapshot):
+        values, meetings = snapshot
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO config VALUES (?, ?)",
+                                   [(key, value) for key, value in values.items()
+                                    if self._written_values.get(key) != value])
+            self._conn.executemany("DELETE FROM config WHERE key = ?",
+                                   [(key,) for key in self._written_values.keys() - values.keys()])
+            self._conn.executemany("INSERT OR REPLACE INTO guild_meetings VALUES (?, ?, ?, ?)",
+                                   [(*key, *row) for key, row in meetings.items()
+                                    if self._written_meetings.get(key) != row])
+            self._conn.executemany("DELETE FROM guild_meetings WHERE guild_id = ? AND meeting_id = ?",
+                                   list(self._written_meetings.keys() - meetings.keys()))
+        self._written_values = values
+        self._written_meetings = meetings
+
+
+class MemoryConfigStore(ConfigStore):
+    """Config that is never written anywhere, for processes that must leave the shared config
+    to its owner, such as sync workers."""
+
+    def __init__(self, config: Optional[Dict] = None):
+        super().__init__()
+        self.config = config
+
+    def load(self) -> Optional[Dict]:
+        return self.config
+
+    def _snapshot(self, config: Dict):
+        return None
+
+    def _write(self, snapshot):
+        pass
+
+
+def open_config_store(config_file: str) -> ConfigStore:
+    """Pick the config backend from CONFIG_BACKEND ("json" by default, or "sqlite")."""
+    delay = get_env_float("CONFIG_FLUSH_DELAY", 1.0)
+    if os.getenv("CONFIG_BACKEND", "json").lower() == "sqlite":
+        db_path = os.getenv("CONFIG_DB") or f"{os.path.splitext(config_file)[0]}.db"
+        return SqliteConfigStore(db_path, import_path=config_file, delay=delay)
+    return JsonConfigStore(config_file, delay=delay)
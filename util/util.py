@@ -1,4 +1,11 @@
 import os
+import re
+import sys
+
+DISCORD_API_BASE = "https://discord.com/api/v10"
+
+# Path segments whose following ID is a "major parameter" that splits Discord rate-limit buckets
+DISCORD_MAJOR_PARAMS = ("guilds", "channels", "webhooks")
 
 
 def get_env_var(key: str) -> str:
@@ -14,8 +21,13 @@ def get_notion_url(page_id: str) -> str:
     return f"https://api.notion.com/v1/databases/{page_id}/query"
 
 
+def get_discord_api_base() -> str:
+    """Discord REST root, overridable with DISCORD_API_BASE to point the bot at a stand-in server."""
+    return os.getenv("DISCORD_API_BASE") or DISCORD_API_BASE
+
+
 def get_discord_base_url(guild_id: str) -> str:
-    return f"https://discord.com/api/v10/guilds/{guild_id}"
+    return f"{get_discord_api_base()}/guilds/{guild_id}"
 
 
 def get_discord_event_url(guild_id: str) -> str:
@@ -25,3 +37,35 @@ def get_discord_event_url(guild_id: str) -> str:
 def get_discord_channels_url(guild_id: str) -> str:
     return f"{get_discord_base_url(guild_id)}/channels"
 
+
+def get_discord_route_key(method: str, url: str) -> str:
+    """Reduce a Discord REST URL to its rate-limit route, e.g. PATCH /guilds/1/scheduled-events/{id}."""
+    path = url.split("?", 1)[0].replace(get_discord_api_base(), "")
+    segments = path.strip("/").split("/")
+    for i, segment in enumerate(segments):
+        if re.fullmatch(r"\d+", segment) and (i == 0 or segments[i - 1] not in DISCORD_MAJOR_PARAMS):
+            segments[i] = "{id}"
+    return f"{method.upper()} /{'/'.join(segments)}"
+
+
+
+def get_env_int(key: str, default: int) -> int:
+    val = os.getenv(key)
+    return int(val) if val else default
+
+
+def get_env_float(key: str, default: float) -> float:
+    val = os.getenv(key)
+    return float(val) if val else default
+
+
+def get_rss_bytes() -> int:
+    """Current resident set size of this process, falling back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes everywhere else
+        return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,131 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+from typing import TYPE_CHECKING, Awaitable, Callable, Iterable, Optional, Set
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+
+def _page_ids_from_payload(payload: dict) -> Set[str]:
+    """Page IDs referenced by a Notion webhook event or a database automation callback."""
+    page_ids = set()
+    # Integration webhooks: {"type": "page.properties_updated", "entity": {"id": ..., "type": "page"}, ...}
+    entity = payload.get("entity") or {}
+    if entity.get("type") == "page" and entity.get("id"):
+        page_ids.add(entity["id"])
+    # "Send webhook" automations post the page itself under "data"
+    data = payload.get("data") or {}
+    if data.get("object") == "page" and data.get("id"):
+        page_ids.add(data["id"])
+    return page_ids
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class NotionWebhookReceiver:
+    """Small HTTP endpoint on the bot's event loop that turns Notion callbacks into meeting syncs.
+
+    Page IDs from callbacks arriving within ``debounce`` seconds of each other are merged
+    and handed to ``on_pages`` in one batch. When ``secret`` is set, requests must carry
+    either a valid ``X-Notion-Signature`` HMAC or an ``X-Webhook-Secret`` header matching it.
+    Without a secret only a loopback host, e.g. behind a reverse proxy, accepts callbacks;
+    anywhere else just the verification handshake is answered.
+    """
+
+    def __init__(self, on_pages: Callable[[Set[str]], Awaitable], host: str = "0.0.0.0", port: int = 8080,
+                 path: str = "/notion/webhook", secret: Optional[str] = None, debounce: float = 2.0):
+        self.on_pages = on_pages
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret = secret
+        self.debounce = debounce
+        self._pending: Set[str] = set()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._runner: Optional["web.AppRunner"] = None
+
+    async def start(self):
+        # aiohttp's server half is only loaded when webhooks are actually enabled
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post(self.path, self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"Listening for Notion webhooks on {self.host}:{self.port}{self.path}")
+        if not self.secret and not _is_loopback(self.host):
+            print("WEBHOOK_SECRET is not set, rejecting webhook callbacks on a non-loopback host")
+
+    def is_running(self) -> bool:
+        return self._runner is not None
+
+    async def stop(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def _authorised(self, request: "web.Request", body: bytes) -> bool:
+        if not self.secret:
+            # Otherwise anyone who can reach the port could make the bot fetch pages
+            return _is_loopback(self.host)
+        signature = request.headers.get("X-Notion-Signature", "")
+        if signature:
+            expected = "sha256=" + hmac.new(self.secret.encode(), body, hashlib.sha256).hexdigest()
+            return hmac.compare_digest(signature, expected)
+        return hmac.compare_digest(request.headers.get("X-Webhook-Secret", ""), self.secret)
+
+    async def handle(self, request: "web.Request") -> "web.Response":
+        from aiohttp import web
+
+        body = await request.read()
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return web.Response(status=400, text="Invalid JSON")
+        if not isinstance(payload, dict):
+            return web.Response(status=400, text="Expected a JSON object")
+
+        if "verification_token" in payload:
+            # One-off handshake when the subscription is created, the token becomes the signing secret
+            print(f"Notion webhook verification token: {payload['verification_token']}")
+            return web.Response(status=200)
+
+        if not self._authorised(request, body):
+            return web.Response(status=401)
+
+        page_ids = _page_ids_from_payload(payload)
+        if page_ids:
+            self.queue(page_ids)
+        return web.Response(status=202)
+
+    def queue(self, page_ids: Iterable[str]):
+        self._pending.update(page_ids)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.debounce, self._flush)
+
+    def _flush(self):
+        page_ids, self._pending = self._pending, set()
+        self._flush_handle = None
+        task = asyncio.ensure_future(self.on_pages(page_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Error handling Notion webhook: {task.exception()!r}")
@@ -0,0 +1,122 @@
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from util.metrics import REGISTRY
+
+
+def worker_index(key: str, count: int) -> int:
+    """Worker that owns ``key``; crc32 rather than hash(), which differs between processes."""
+    return zlib.crc32(key.encode()) % count
+
+
+class WorkerError(RuntimeError):
+    """A job failed inside a worker process; carries the worker's description of the error."""
+
+
+class WorkerPool:
+    """Worker processes fed through multiprocessing queues, for work that should stay off the gateway's loop.
+
+    Each worker has its own request queue and jobs are routed by key, so everything for
+    one key, e.g. one guild, always lands on the same worker. Replies come back on a
+    shared queue read by a thread, which hands them to the loop the pool was started on.
+    A reply is ``(job_id, error, result, metrics)``, where ``metrics`` are the worker's
+    ``REGISTRY.take_deltas()``, merged here so this process's ``/metrics`` covers the
+    API calls and syncs the workers made. ``make_args(index)`` gives the arguments
+    ``target`` is started with, ahead of its request and response queues; it is called
+    again when a dead worker is restarted.
+    """
+
+    def __init__(self, target: Callable, count: int, make_args: Callable[[int], Tuple] = lambda index: (index,),
+                 timeout: float = 120.0):
+        self.target = target
+        self.count = max(1, count)
+        self.make_args = make_args
+        self.timeout = timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._requests: List[Any] = []
+        self._responses: Optional[Any] = None
+        self._processes: List[Any] = []
+        self._reader: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+
+    def start(self):
+        """Start the workers; call it from the event loop jobs will be submitted on."""
+        self._loop = asyncio.get_running_loop()
+        self._responses = self._context.Queue()
+        self._requests = [self._context.Queue() for _ in range(self.count)]
+        self._processes = [self._spawn(index) for index in range(self.count)]
+        self._reader = threading.Thread(target=self._read, name="worker-replies", daemon=True)
+        self._reader.start()
+
+    def is_running(self) -> bool:
+        return bool(self._processes)
+
+    def _spawn(self, index: int):
+        process = self._context.Process(target=self.target, name=f"worker-{index}", daemon=True,
+                                        args=(*self.make_args(index), self._requests[index], self._responses))
+        process.start()
+        return process
+
+    def worker_for(self, key: str) -> int:
+        return worker_index(key, self.count)
+
+    async def submit(self, key: str, kind: str, **kwargs) -> Any:
+        """Run a job on the worker that owns ``key`` and return its result."""
+        return await self.submit_to(self.worker_for(key), kind, **kwargs)
+
+    async def broadcast(self, kind: str, **kwargs) -> List[Any]:
+        """Run the same job on every worker, returning their results in worker order."""
+        return list(await asyncio.gather(*(self.submit_to(index, kind, **kwargs) for index in range(self.count))))
+
+    async def submit_to(self, index: int, kind: str, **kwargs) -> Any:
+        if not self._processes[index].is_alive():
+            print(f"Worker {index} exited with code {self._processes[index].exitcode}, restarting it")
+            self._processes[index] = self._spawn(index)
+        job_id = next(self._ids)
+        future = self._loop.create_future()
+        self._pending[job_id] = future
+        try:
+            self._requests[index].put((job_id, kind, kwargs))
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(job_id, None)
+
+    def _read(self):
+        while True:
+            reply = self._responses.get()
+            if reply is None:
+                return
+            # Handled on the loop, which is the only one touching the registry and the futures
+            self._loop.call_soon_threadsafe(self._resolve, *reply)
+
+    def _resolve(self, job_id: int, error: Optional[str], result: Any, metrics: Dict[str, Dict]):
+        # Merged even when nobody waits any more, the calls were made all the same
+        REGISTRY.merge_deltas(metrics)
+        future = self._pending.get(job_id)
+        # The caller may have timed out or been cancelled meanwhile
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(WorkerError(error))
+        else:
+            future.set_result(result)
+
+    def stop(self, timeout: float = 10.0):
+        """Ask every worker to finish, then terminate any that don't within ``timeout``."""
+        for queue in self._requests:
+            queue.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        if self._responses is not None:
+            self._responses.put(None)
+        if self._reader is not None:
+            self._reader.join(timeout)
+        self._processes = []